@@ -0,0 +1,114 @@
+"""URL templates for TIGER/Line and cartographic boundary files"""
+
+_TIGER = "https://www2.census.gov/geo/tiger"
+
+# Templates for each kind of file. "cb" and "tiger" are the usual
+# cartographic boundary and TIGER/Line locations; keys like "cb_2013"
+# override them for years the Census Bureau published in a different layout.
+_TEMPLATES = {
+    "cbsa": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_cbsa_{resolution}.zip",
+        "cb_2013": _TIGER + "/GENZ{year}/cb_{year}_us_cbsa_{resolution}.zip",
+        "cb_2010": _TIGER + "/GENZ2010/gz_2010_us_310_m1_{resolution}.zip",
+        "tiger": _TIGER + "/TIGER{year}/CBSA/tl_{year}_us_cbsa.zip",
+        "tiger_2010": _TIGER + "/TIGER2010/CBSA/2010/tl_2010_us_cbsa10.zip"
+    },
+    "ua": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_ua10_500k.zip",
+        "cb_2013": _TIGER + "/GENZ{year}/cb_{year}_us_ua10_500k.zip",
+        "tiger": _TIGER + "/TIGER{year}/UAC/tl_{year}_us_uac10.zip"
+    },
+    "csa": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_csa_{resolution}.zip",
+        "cb_2013": _TIGER + "/GENZ{year}/cb_{year}_us_csa_{resolution}.zip",
+        "tiger": _TIGER + "/TIGER{year}/CSA/tl_{year}_us_csa.zip"
+    },
+    "metdiv": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_metdiv_{resolution}.zip",
+        "cb_2013": _TIGER + "/GENZ{year}/cb_{year}_us_metdiv_{resolution}.zip",
+        "tiger": _TIGER + "/TIGER{year}/METDIV/tl_{year}_us_metdiv.zip"
+    },
+    "necta": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_necta_500k.zip",
+        "tiger": _TIGER + "/TIGER{year}/NECTA/tl_{year}_us_necta.zip"
+    },
+    "cnecta": {
+        "tiger": _TIGER + "/TIGER{year}/CNECTA/tl_{year}_us_cnecta.zip"
+    },
+    "nectadiv": {
+        "tiger": _TIGER + "/TIGER{year}/NECTADIV/tl_{year}_us_nectadiv.zip"
+    },
+    "cd": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_cd{congress}_{resolution}.zip",
+        "cb_2013": _TIGER + "/GENZ{year}/cb_{year}_us_cd{congress}_{resolution}.zip",
+        "tiger": _TIGER + "/TIGER{year}/CD/tl_{year}_us_cd{congress}.zip"
+    },
+    "aiannh": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_aiannh_500k.zip",
+        "tiger": _TIGER + "/TIGER{year}/AIANNH/tl_{year}_us_aiannh.zip"
+    },
+    "aitsn": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_aitsn_500k.zip",
+        "tiger": _TIGER + "/TIGER{year}/AITSN/tl_{year}_us_aitsn.zip",
+        # Before 2015 the national tribal subdivisions lived in an AITS folder
+        **{f"tiger_{y}": _TIGER + "/TIGER{year}/AITS/tl_{year}_us_aitsn.zip" for y in range(2000, 2015)}
+    },
+    "anrc": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_02_anrc_500k.zip",
+        "tiger": _TIGER + "/TIGER{year}/ANRC/tl_{year}_02_anrc.zip"
+    },
+    "tbg": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_tbg_500k.zip",
+        "tiger": _TIGER + "/TIGER{year}/TBG/tl_{year}_us_tbg.zip"
+    },
+    "ttract": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_ttract_500k.zip",
+        "tiger": _TIGER + "/TIGER{year}/TTRACT/tl_{year}_us_ttract.zip"
+    },
+    "primaryroads": {
+        "tiger": _TIGER + "/TIGER{year}/PRIMARYROADS/tl_{year}_us_primaryroads.zip"
+    },
+    "roads": {
+        "tiger": _TIGER + "/TIGER{year}/ROADS/tl_{year}_{state}{county}_roads.zip"
+    },
+    "prisecroads": {
+        "tiger": _TIGER + "/TIGER{year}/PRISECROADS/tl_{year}_{state}_prisecroads.zip"
+    },
+    "addrfeat": {
+        "tiger": _TIGER + "/TIGER{year}/ADDRFEAT/tl_{year}_{state}{county}_addrfeat.zip"
+    },
+    "areawater": {
+        "tiger": _TIGER + "/TIGER{year}/AREAWATER/tl_{year}_{state}{county}_areawater.zip"
+    },
+    "linearwater": {
+        "tiger": _TIGER + "/TIGER{year}/LINEARWATER/tl_{year}_{state}{county}_linearwater.zip"
+    },
+    "rails": {
+        "tiger": _TIGER + "/TIGER{year}/RAILS/tl_{year}_us_rails.zip"
+    },
+    "region": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_region_{resolution}.zip"
+    },
+    "nation": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_nation_{resolution}.zip"
+    },
+    "division": {
+        "cb": _TIGER + "/GENZ{year}/shp/cb_{year}_us_division_{resolution}.zip"
+    }
+}
+
+
+def _tiger_template(kind, year, cb = False):
+    # The bound format method of the template for a kind of file and year,
+    # so that loops over states or counties only look it up once
+    templates = _TEMPLATES[kind]
+
+    source = "cb" if cb else "tiger"
+
+    # Prefer a year-specific template when one exists
+    return templates.get(f"{source}_{year}", templates.get(source)).format
+
+
+def _build_tiger_url(kind, year, cb = False, resolution = "500k", **fields):
+    return _tiger_template(kind, year, cb)(year = year, resolution = resolution, **fields)
+
@@ -5,6 +5,7 @@ import appdirs
 import os
 from pygris.enumeration_units import states, counties, tracts, block_groups, blocks
 from pygris.geometry import _get_geometry
+from pygris.helpers import logger
 import warnings
 
 
@@ -273,7 +274,7 @@ def get_lodes(state, year, version = "LODES8", lodes_type = "od", part = "main",
     lodes_data = lodes_data.reset_index()
     # Handle geometry requests
     if return_geometry:
-        print("Requesting feature geometry.") 
+        logger.info("Requesting feature geometry.")
 
         if not cache:
             ("Use cache = True to speed this up in the future.")
@@ -334,7 +335,7 @@ def get_lodes(state, year, version = "LODES8", lodes_type = "od", part = "main",
     
     elif return_lonlat:
         warnings.filterwarnings('ignore')
-        print("Requesting feature geometry to determine longitude and latitude.") 
+        logger.info("Requesting feature geometry to determine longitude and latitude.")
 
         if not cache:
             ("Use cache = True to speed this up in the future.")
@@ -2,7 +2,7 @@
 
 __author__ = "Kyle Walker <kyle@walker-data.com"
 
-from .helpers import _load_tiger, validate_state, validate_county, fips_codes
+from .helpers import logger, _resolve_year, _load_tiger, _where_in, validate_state, validate_state_many, validate_county, fips_codes
 import pandas as pd
 
 def counties(state = None, cb = False, resolution = '500k', year = None, cache = False, subset_by = None):
@@ -57,9 +57,7 @@ def counties(state = None, cb = False, resolution = '500k', year = None, cache =
 
 
     """
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
+    year = _resolve_year("counties", year)
     
     if resolution not in ['500k', '5m', '20m']:
         raise ValueError("Invalid value for resolution. Valid values are '500k', '5m', and '20m'.")
@@ -84,12 +82,11 @@ def counties(state = None, cb = False, resolution = '500k', year = None, cache =
         else:
             url = f"https://www2.census.gov/geo/tiger/TIGER{year}/COUNTY/tl_{year}_us_county.zip"
 
-    ctys = _load_tiger(url, cache = cache, subset_by = subset_by)
-
+    # Filter to the requested states as the file is read
     if state is not None:
         if type(state) is not list:
             state = [state]
-        valid_state = [validate_state(x) for x in state]
+        valid_state = validate_state_many(state)
 
         if year == 1990:
             state_col = 'ST'
@@ -98,7 +95,11 @@ def counties(state = None, cb = False, resolution = '500k', year = None, cache =
         else: 
             state_col = 'STATEFP'
 
-        ctys = ctys.query(f'{state_col} in @valid_state')
+        where = _where_in(state_col, valid_state)
+    else:
+        where = None
+
+    ctys = _load_tiger(url, cache = cache, subset_by = subset_by, where = where)
 
     return ctys
 
@@ -152,14 +153,12 @@ def tracts(state = None, county = None, cb = False, year = None, cache = False,
     
     
     """
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
+    year = _resolve_year("tracts", year)
 
     if state is None:
         if year > 2018 and cb is True:
             state = 'us'
-            print("Retrieving Census tracts for the entire United States")
+            logger.info("Retrieving Census tracts for the entire United States")
         else:
             raise ValueError("A state is required for this year/dataset combination.")
     else:
@@ -190,7 +189,7 @@ def tracts(state = None, county = None, cb = False, year = None, cache = False,
         if type(county) is not list:
             county = [county]
         valid_county = [validate_county(state, x) for x in county]
-        trcts = trcts.query('COUNTYFP in @valid_county')
+        trcts = trcts.loc[trcts['COUNTYFP'].isin(valid_county)]
 
     return trcts
 
@@ -245,14 +244,12 @@ def block_groups(state = None, county = None, cb = False, year = None, cache = F
     
     
     """
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
+    year = _resolve_year("block_groups", year)
 
     if state is None:
         if year > 2018 and cb is True:
             state = 'us'
-            print("Retrieving Census block groups for the entire United States")
+            logger.info("Retrieving Census block groups for the entire United States")
         else:
             raise ValueError("A state is required for this year/dataset combination.")
     else:
@@ -283,7 +280,7 @@ def block_groups(state = None, county = None, cb = False, year = None, cache = F
         if type(county) is not list:
             county = [county]
         valid_county = [validate_county(state, x) for x in county]
-        bgs = bgs.query('COUNTYFP in @valid_county')
+        bgs = bgs.loc[bgs['COUNTYFP'].isin(valid_county)]
 
     return bgs
 
@@ -337,14 +334,12 @@ def school_districts(state = None, type = "unified", cb = False, year = None, ca
 
 
     """
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
+    year = _resolve_year("school_districts", year)
 
     if state is None:
         if year > 2018 and cb is True:
             state = "us"
-            print("Retrieving school districts for the entire United States")
+            logger.info("Retrieving school districts for the entire United States")
         else:
             raise ValueError("A state must be specified for this year/dataset combination.")
     else:
@@ -404,9 +399,7 @@ def states(cb = True, resolution = "500k", year = None, cache = False):
     if resolution not in ["500k", "5m", "20m"]:
         raise ValueError("Invalid value for resolution. Valid values are '500k', '5m', and '20m'.")
     
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
+    year = _resolve_year("states", year)
     
     if cb:
         if year in [1990, 2000]:
@@ -482,18 +475,16 @@ def pumas(state = None, cb = False, year = None, cache = False, subset_by = None
 
     """
     
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
+    year = _resolve_year("pumas", year)
     
     if state is None:
         if year == 2019 and cb:
             state = "us"
-            print("Retrieving PUMAs for the entire United States")
+            logger.info("Retrieving PUMAs for the entire United States")
         else:
             fips = fips_codes()
 
-            print("Retrieving PUMAs by state and combining the result")
+            logger.info("Retrieving PUMAs by state and combining the result")
             all_states = [code for code in fips['state_code'].unique().tolist() if code <= "56"]
 
             all_pumas = pd.concat([pumas(x, year = year, cache = cache) for x in all_states])
@@ -573,9 +564,7 @@ def places(state = None, cb = False, year = None, cache = False, subset_by = Non
 
     """
 
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
+    year = _resolve_year("places", year)
     
     if state is None:
         if year < 2019:
@@ -584,7 +573,7 @@ def places(state = None, cb = False, year = None, cache = False, subset_by = Non
             raise ValueError("Retrieving Census-designated data for the entire US only available when cb is set to True")
         else:
             state = "us"
-            print("Retrieving Census-designated places for the entire United States")
+            logger.info("Retrieving Census-designated places for the entire United States")
     else:
         state = validate_state(state)
     
@@ -653,9 +642,7 @@ def zctas(cb = False, starts_with = None, year = None, state = None, cache = Fal
 
     """
 
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
+    year = _resolve_year("zctas", year)
     
     if state is not None and year > 2010:
         raise ValueError("ZCTAs are only available by state for 2000 and 2010.")
@@ -769,9 +756,7 @@ def blocks(state, county = None, year = None, cache = False, subset_by = None):
     
     """
 
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
+    year = _resolve_year("blocks", year)
 
     if year == 1990:
         raise ValueError("Block files are not available for 1990.")
@@ -803,12 +788,12 @@ def blocks(state, county = None, year = None, cache = False, subset_by = None):
             if type(county) is not list:
                 county = [county]
             valid_county = [validate_county(state, x) for x in county]
-            blks = blks.query('COUNTYFP20 in @valid_county')
+            blks = blks.loc[blks['COUNTYFP20'].isin(valid_county)]
         else:
             if type(county) is not list:
                 county = [county]
             valid_county = [validate_county(state, x) for x in county]
-            blks = blks.query('COUNTYFP10 in @valid_county')
+            blks = blks.loc[blks['COUNTYFP10'].isin(valid_county)]
     
     return blks
 
@@ -864,9 +849,7 @@ def county_subdivisions(state, county = None, cb = False, year = None, cache = F
     
     """
 
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
+    year = _resolve_year("county_subdivisions", year)
     
     state = validate_state(state)
 
@@ -889,7 +872,7 @@ def county_subdivisions(state, county = None, cb = False, year = None, cache = F
         if type(county) is not list:
             county = [county]
         valid_county = [validate_county(state, x) for x in county]
-        cs = cs.query('COUNTYFP in @valid_county')
+        cs = cs.loc[cs['COUNTYFP'].isin(valid_county)]
     
     return cs
 
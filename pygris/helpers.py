@@ -1,80 +1,928 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.exceptions import HTTPError as Urllib3Error
 import geopandas as gp
 import os
+import shutil
+import io
+import urllib.request
 import appdirs
+import logging
+import functools
+import importlib.util
+import collections
+import threading
+import asyncio
 import pandas as pd
-import re
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pygris.internal_data import fips_path
+from pygris._urls import _tiger_template
+from shapely.geometry import box
 from pygris.geocode import geocode
 
-def _load_tiger(url, cache = False, subset_by = None):
+# Informational messages go through the "pygris" logger; the library adds
+# no handlers of its own beyond a NullHandler
+logger = logging.getLogger("pygris")
+logger.addHandler(logging.NullHandler())
+
+# Read shapefiles with pyogrio's vectorized reader when it is installed,
+# falling back to fiona otherwise
+try:
+    import pyogrio
+    _ENGINE = "pyogrio"
+except ImportError:
+    _ENGINE = "fiona"
+
+# With pyarrow installed, cached layers also get a GeoParquet copy
+# that can be read back much faster than the zipped shapefile
+try:
+    import pyarrow
+    _PARQUET = True
+except ImportError:
+    _PARQUET = False
+
+# Options passed to every geopandas.read_file() call. With both pyogrio
+# and pyarrow available, features are read through GDAL's Arrow stream
+# interface rather than field by field.
+_READ_OPTIONS = {"engine": _ENGINE}
+
+if _ENGINE == "pyogrio" and _PARQUET:
+    _READ_OPTIONS["use_arrow"] = True
+
+# Options for writing cached GeoParquet copies. Since geopandas 1.0 each
+# row also stores its bounding box, so bounding-box reads of the copy can
+# skip the rows (and row groups) outside the box.
+_PARQUET_WRITE_OPTIONS = {"compression": "zstd"}
+
+if int(gp.__version__.split(".")[0]) >= 1:
+    _PARQUET_WRITE_OPTIONS["write_covering_bbox"] = True
+
+# Options for stacking per-state and per-county downloads. The frames are
+# not used again once combined, so before pandas 3 (where copy-on-write
+# makes this the default) their data is not copied.
+_CONCAT_OPTIONS = {"ignore_index": True, "sort": False}
+
+if int(pd.__version__.split(".")[0]) < 3:
+    _CONCAT_OPTIONS["copy"] = False
+
+# TIGER/Line and cartographic boundary files are all in NAD83
+_TIGER_CRS = "EPSG:4269"
+
+# Block size used when copying downloads to disk
+_DOWNLOAD_BLOCKSIZE = 1 << 20
+
+# Files read straight into memory are requested in blocks of this size,
+# with up to _RANGE_WORKERS blocks in flight at once
+_RANGE_SIZE = 32 << 20
+_RANGE_WORKERS = 4
+
+# Seconds to wait for a connection to a server, and for each block of
+# data once a download is under way. Revalidating a cached file gets a
+# much shorter wait: if the server doesn't answer promptly, the cached
+# copy is simply used as it is.
+_CONNECT_TIMEOUT = 30
+_READ_TIMEOUT = 300
+_REVALIDATE_TIMEOUT = 5
+
+_CENSUS_HTTPS = "https://www2.census.gov/"
+_CENSUS_FTP = "ftp://ftp2.census.gov/"
+
+# A single session is shared by every TIGER download so that connections
+# to the Census servers are kept alive and reused between requests. TIGER
+# files are already zipped, so they are requested without any transfer
+# encoding.
+_SESSION = requests.Session()
+_SESSION.headers["Accept-Encoding"] = "identity"
+_ADAPTER = HTTPAdapter(pool_maxsize = 16, max_retries = Retry(total = 3, connect = 1, read = 1,
+                                                               backoff_factor = 0.5))
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+# With httpx (and h2) installed, downloads go through an HTTP/2 client
+# instead, so that concurrent requests to the Census servers share a
+# single multiplexed connection. Setting up its TLS context takes a
+# noticeable fraction of a second, so the client is only created (by
+# _client()) when the first download starts, not on import.
+_HTTPX = importlib.util.find_spec("httpx") is not None and importlib.util.find_spec("h2") is not None
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+_NETWORK_ERRORS = (requests.RequestException, Urllib3Error)
+
+# Base URL of an optional GeoParquet mirror of the TIGER/Line files, used
+# when a function is called with format = "parquet"
+_PARQUET_MIRROR = os.environ.get("PYGRIS_PARQUET_MIRROR")
+
+# Parsed TIGER layers read during this session, keyed by URL and
+# attribute filter. Only the most recently used layers are kept, since
+# national files can run to hundreds of megabytes once parsed.
+_GDF_CACHE = collections.OrderedDict()
+_GDF_CACHE_SIZE = 32
+_GDF_CACHE_LOCK = threading.Lock()
+
+# URLs whose cached files have been checked against the server this
+# session. After a revalidation fails to reach the server, no more are
+# tried, so that a session without a network doesn't wait on every file.
+_VALIDATED = set()
+_REVALIDATION_FAILED = False
+
+# A one-feature GeoJSON layer in NAD83, read by warmup() to load the GDAL
+# drivers and PROJ database before the first real file arrives
+_WARMUP_LAYER = (b'{"type": "FeatureCollection", "crs": {"type": "name", "properties": '
+                 b'{"name": "urn:ogc:def:crs:EPSG::4269"}}, "features": [{"type": "Feature", '
+                 b'"properties": {"GEOID": "01"}, "geometry": {"type": "Point", "coordinates": [-86.8, 32.8]}}]}')
+
+# Set once the background warm-up has been started
+_WARMED_UP = False
+
+# Year used when a function is called without one
+_DEFAULT_YEAR = 2021
+
+@functools.lru_cache(maxsize = None)
+def _notify_default_year(fn, year):
+    # Report the default year once per function and year rather than
+    # on every call
+    logger.info("Using the default year of %s for %s", year, fn)
+
+
+def _resolve_year(fn, year):
+    # Fill in the default year for a call to fn made without one
+    if year is None:
+        year = _DEFAULT_YEAR
+        _notify_default_year(fn, year)
+
+    return year
+
+
+def _client():
+    # The shared httpx client, created on first use; None without httpx
+    global _HTTPX, _CLIENT, _NETWORK_ERRORS
+
+    if _HTTPX and _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                try:
+                    import httpx
+                    _CLIENT = httpx.Client(http2 = True, follow_redirects = True,
+                                           timeout = httpx.Timeout(_READ_TIMEOUT, connect = _CONNECT_TIMEOUT),
+                                           headers = {"Accept-Encoding": "identity"},
+                                           limits = httpx.Limits(max_keepalive_connections = 8))
+                    _NETWORK_ERRORS = (requests.RequestException, Urllib3Error, httpx.HTTPError)
+                except ImportError:
+                    _HTTPX = False
+
+    return _CLIENT
+
+
+def get_session():
+    """
+    Get the HTTP session pygris uses to download Census files
+
+    Settings made on the returned object, such as headers, proxies or
+    authentication, apply to every subsequent pygris download.
+
+    Returns
+    ----------
+    httpx.Client if httpx is installed, otherwise requests.Session: The shared session.
+    """
+    client = _client()
+
+    if client is not None:
+        return client
+
+    return _SESSION
+
+
+def warmup():
+    """
+    Load the GDAL drivers, GEOS and the PROJ database ahead of the first download
+
+    pygris calls this in the background the first time it downloads a file,
+    so that the one-time library start-up cost overlaps with the download. 
+    It can also be called directly, for example right after importing pygris.
+
+    Returns
+    ----------
+    None
+    """
+    if _ENGINE == "pyogrio":
+        source = _WARMUP_LAYER
+    else:
+        source = io.BytesIO(_WARMUP_LAYER)
+
+    layer = gp.read_file(source, **_READ_OPTIONS)
+
+    layer.to_crs('ESRI:102010')
+
+
+def _start_warmup():
+    # Run warmup() on a background thread, once per session. Loads on
+    # several worker threads can get here at the same time, so the flag
+    # is checked and set under a lock.
+    global _WARMED_UP
+
+    with _GDF_CACHE_LOCK:
+        if _WARMED_UP:
+            return
+
+        _WARMED_UP = True
+
+    threading.Thread(target = _background_warmup, daemon = True).start()
+
+
+def _background_warmup():
+    # The warm-up only saves time, so a failure is logged rather than
+    # left to surface as a thread traceback
+    try:
+        warmup()
+    except Exception:
+        logger.warning("Background warm-up failed", exc_info = True)
+
+
+def _get(url, headers = None):
+    # A single GET through the shared client
+    client = _client()
+
+    if client is not None:
+        return client.get(url, headers = headers)
+
+    return _SESSION.get(url = url, headers = headers, timeout = (_CONNECT_TIMEOUT, _READ_TIMEOUT))
+
+
+def _ftp_url(url):
+    # The Census Bureau mirrors www2.census.gov on its FTP server, which
+    # is tried when the HTTPS download fails outright
+    if url.startswith(_CENSUS_HTTPS):
+        return _CENSUS_FTP + url[len(_CENSUS_HTTPS):]
+
+    return None
+
+
+def _check_status(response, url):
+    # Raise for an error response before anything is done with its body.
+    # A file missing from the server is reported as such; other errors are
+    # raised as network errors, so fresh downloads fall back to FTP and
+    # revalidations keep the cached copy.
+    if response.status_code in (404, 410):
+        raise ValueError(f"{url} was not found on the Census Bureau's servers. "
+                         "Check that the data you requested are published for that year and geography.")
+
+    response.raise_for_status()
+
+
+def _get_content(url):
+    # The body of a plain GET, once its status has been checked
+    response = _get(url)
+
+    _check_status(response, url)
+
+    return response.content
+
+
+def _download_ranges(url):
+    # Ask for the first block of the file only. Small files arrive whole;
+    # for larger ones, the response gives the total size, and the rest of
+    # the file is fetched as byte ranges on several connections at once.
+    first = _get(url, {"Range": f"bytes=0-{_RANGE_SIZE - 1}"})
+
+    _check_status(first, url)
+
+    # Servers that ignore the Range header send the whole file
+    if first.status_code != 206:
+        return first.content
+
+    total = first.headers.get("Content-Range", "").rpartition("/")[2]
+
+    if not total.isdigit():
+        return _get_content(url)
+
+    total = int(total)
+
+    if total <= _RANGE_SIZE:
+        return first.content
+
+    def fetch(start):
+        end = min(start + _RANGE_SIZE, total) - 1
+        return _get(url, {"Range": f"bytes={start}-{end}"})
+
+    with ThreadPoolExecutor(max_workers = _RANGE_WORKERS) as executor:
+        rest = list(executor.map(fetch, range(_RANGE_SIZE, total, _RANGE_SIZE)))
+
+    if any(r.status_code != 206 for r in rest):
+        return _get_content(url)
+
+    return b"".join([first.content] + [r.content for r in rest])
+
+
+def _download_bytes(url):
+    # Fetch a whole file into memory
+    try:
+        return _download_ranges(url)
+    except _NETWORK_ERRORS as error:
+        ftp_url = _ftp_url(url)
+
+        if ftp_url is None:
+            raise
+
+        # If the FTP server fails as well, the original error is the one
+        # worth reporting
+        try:
+            with urllib.request.urlopen(ftp_url, timeout = _CONNECT_TIMEOUT) as src:
+                return src.read()
+        except OSError:
+            raise error
+
+
+def _validator(headers):
+    # The ETag, or failing that the Last-Modified date, identifies the
+    # version of a file on the server
+    return headers.get("ETag") or headers.get("Last-Modified")
+
+
+def _download_file(url, out_file, headers = None):
+    # Stream the raw bytes to a temporary file in 1 MiB blocks, then move
+    # it into place. When the request carries conditional headers and the
+    # server answers 304 Not Modified, the existing file is left alone, as
+    # it is for an error status, which is raised before anything is
+    # written. Returns whether a new file was written.
+    part_file = out_file + ".part"
+
+    client = _client()
+
+    if headers is None:
+        timeout = (_CONNECT_TIMEOUT, _READ_TIMEOUT)
+    else:
+        timeout = (_REVALIDATE_TIMEOUT, _REVALIDATE_TIMEOUT)
+
+    try:
+        if client is not None:
+            import httpx
+            with client.stream("GET", url, headers = headers,
+                               timeout = httpx.Timeout(timeout[1], connect = timeout[0])) as req:
+                if req.status_code == 304:
+                    return False
+                _check_status(req, url)
+                with open(part_file, 'wb') as fd:
+                    for chunk in req.iter_raw(_DOWNLOAD_BLOCKSIZE):
+                        fd.write(chunk)
+                validator = _validator(req.headers)
+        else:
+            with _SESSION.get(url = url, stream = True, headers = headers, timeout = timeout) as req:
+                if req.status_code == 304:
+                    return False
+                _check_status(req, url)
+                with open(part_file, 'wb') as fd:
+                    shutil.copyfileobj(req.raw, fd, _DOWNLOAD_BLOCKSIZE)
+                validator = _validator(req.headers)
+    except _NETWORK_ERRORS as error:
+        # Revalidations are simply skipped when the server can't be
+        # reached; fresh downloads fall back to FTP
+        if os.path.isfile(part_file):
+            os.remove(part_file)
+
+        ftp_url = _ftp_url(url)
+
+        if headers is not None or ftp_url is None:
+            raise
+
+        try:
+            with urllib.request.urlopen(ftp_url, timeout = _CONNECT_TIMEOUT) as src, open(part_file, 'wb') as fd:
+                shutil.copyfileobj(src, fd, _DOWNLOAD_BLOCKSIZE)
+        except OSError:
+            if os.path.isfile(part_file):
+                os.remove(part_file)
+            raise error
+        validator = None
+
+    os.replace(part_file, out_file)
+
+    # Remember which version of the file was downloaded
+    if validator is not None:
+        with open(out_file + ".etag", 'w') as fd:
+            fd.write(validator)
+
+    return True
+
+
+def _refresh_cached(url, out_file):
+    # Revalidate a cached file with a conditional GET, once per URL per
+    # session: the server answers 304 with no body if the cached copy is
+    # current, or sends the new file in the same response. Returns whether
+    # the file was replaced. Files without a stored validator, any failure
+    # to reach the server, and error responses leave the cached copy (and
+    # its validator) in place.
+    global _REVALIDATION_FAILED
+
+    if url in _VALIDATED or _REVALIDATION_FAILED:
+        return False
+
+    etag_file = out_file + ".etag"
+
+    if not os.path.isfile(etag_file):
+        return False
+
+    with open(etag_file) as fd:
+        stored = fd.read()
+
+    # ETags are quoted strings; anything else is a Last-Modified date
+    if stored.startswith(('"', 'W/')):
+        headers = {"If-None-Match": stored}
+    else:
+        headers = {"If-Modified-Since": stored}
+
+    # A file that has gone missing from the server (a ValueError from
+    # _check_status()) keeps its cached copy too
+    try:
+        updated = _download_file(url, out_file, headers = headers)
+    except ValueError:
+        return False
+    except _NETWORK_ERRORS:
+        _REVALIDATION_FAILED = True
+        return False
+
+    _VALIDATED.add(url)
+
+    return updated
+
+
+def _parquet_mirror_url(url):
+    # Point a Census URL at the GeoParquet copy of the same file
+    if _PARQUET_MIRROR is None:
+        raise ValueError("`format = 'parquet'` requires the PYGRIS_PARQUET_MIRROR environment variable to be set to a GeoParquet mirror.")
+
+    name = os.path.splitext(os.path.basename(url))[0]
+
+    return f"{_PARQUET_MIRROR.rstrip('/')}/{name}.parquet"
+
+
+def _subset_frame(gdf, sub):
+    # Apply the same subsets read_file() would to an already-read layer
+    if "where" in sub:
+        gdf = gdf.query(sub["where"].replace(" IN ", " in "))
+
+    if "bbox" in sub:
+        minx, miny, maxx, maxy = sub["bbox"]
+        gdf = gdf.cx[minx:maxx, miny:maxy]
+
+    if "rows" in sub:
+        rows = sub["rows"]
+        gdf = gdf.iloc[rows] if isinstance(rows, slice) else gdf.iloc[:rows]
+
+    if "mask" in sub:
+        mask = gp.GeoSeries([sub["mask"]], crs = _TIGER_CRS).to_crs(gdf.crs)
+
+        # First cut to the mask's bounding box through the spatial index,
+        # then run the exact test only on what remains; the predicate query
+        # prepares the mask, so features well inside or outside it are
+        # settled without a full intersection
+        minx, miny, maxx, maxy = mask.total_bounds
+        gdf = gdf.cx[minx:maxx, miny:maxy]
+
+        idx = gdf.sindex.query(mask.iloc[0], predicate = "intersects")
+        gdf = gdf.iloc[np.sort(idx)]
+
+    return gdf
+
+
+def _read_parquet(source, sub):
+    # Read a GeoParquet file with the same subsets read_file() would apply.
+    # A bounding box is handed to the reader when the file has per-row
+    # bounding boxes; older copies without them are subset in memory.
+    if "bbox" in sub and "where" not in sub:
+        try:
+            gdf = gp.read_parquet(source, bbox = sub["bbox"])
+        except (ValueError, TypeError):
+            pass
+        else:
+            return _subset_frame(gdf, {k: v for k, v in sub.items() if k != "bbox"})
+
+    return _subset_frame(gp.read_parquet(source), sub)
+
+
+def _select_columns(gdf, columns):
+    # Keep the requested attribute columns along with the geometry
+    geometry = gdf.geometry.name
+
+    return gdf[[c for c in columns if c != geometry] + [geometry]]
+
+
+def _where_in(column, values):
+    # Build an OGR SQL attribute filter of the form "COLUMN IN ('a', 'b')"
+    # so that rows can be filtered as the file is read
+    quoted = ", ".join(f"'{v}'" for v in values)
+
+    return f"{column} IN ({quoted})"
+
+
+def _dissolve_mask(mask):
+    # Collapse a multi-row mask into a single geometry so the reader tests
+    # each feature against one shape. The mask is projected to the NAD83
+    # CRS every TIGER/Line file uses and handed over as a plain geometry,
+    # which saves the reader from opening the file a second time just to
+    # look up its CRS.
+    if mask.crs is not None:
+        mask = mask.to_crs(_TIGER_CRS)
+
+    return _union_all(mask)
+
+
+def _union_all(geometry):
+    # Union a GeoSeries or GeoDataFrame into one shapely geometry, using
+    # union_all() where geopandas has it (1.0 and later)
+    if hasattr(geometry, "union_all"):
+        return geometry.union_all()
+    
+    return geometry.unary_union
+
+
+def _filter_intersecting(gdf, geometry):
+    # Keep the rows of gdf that intersect any of the input geometries,
+    # looking candidates up in gdf's spatial index in a single bulk query
+    if isinstance(geometry, gp.GeoDataFrame):
+        geometry = geometry.geometry
+
+    geometry = geometry.to_crs(gdf.crs)
+
+    sindex = gdf.sindex
+
+    if hasattr(sindex, "query_bulk"):
+        idx = sindex.query_bulk(geometry.values, predicate = "intersects")
+    else:
+        idx = sindex.query(geometry.values, predicate = "intersects")
+
+    return gdf.iloc[np.unique(idx[1])]
+
+
+def _subset_key(subset_by):
+    # A hashable stand-in for subset_by to key the layer cache on, or None
+    # for masks and geocoded buffers, whose results aren't cached
+    if subset_by is None:
+        return ()
+    elif type(subset_by) is tuple:
+        return ("bbox",) + subset_by
+    elif type(subset_by) is int:
+        return ("rows", subset_by)
+    elif type(subset_by) is slice:
+        return ("rows", subset_by.start, subset_by.stop, subset_by.step)
+
+    return None
+
+
+def _load_tiger(url, cache = False, subset_by = None, where = None, format = "shp",
+                columns = None, content = None):
+
+    if format == "parquet":
+        url = _parquet_mirror_url(url)
+    elif format != "shp":
+        raise ValueError("Invalid value for format. Valid values are 'shp' and 'parquet'.")
+
+    # Layers are kept in memory once parsed, so repeated calls skip both
+    # the download and the shapefile parse. A copy is returned
+    # so that callers can't modify the cached object.
+    if columns is not None:
+        columns = tuple(columns)
+
+    subset_key = _subset_key(subset_by)
+
+    key = (url, where, columns, subset_key)
+
+    if subset_key is not None:
+        with _GDF_CACHE_LOCK:
+            cached = _GDF_CACHE.get(key)
+
+            if cached is not None:
+                _GDF_CACHE.move_to_end(key)
+
+                return cached.copy()
+
+    sub = {}
+
+    # An attribute filter is passed through to the reader so that
+    # non-matching features are skipped at the source
+    if where is not None:
+        sub["where"] = where
+
+    # Only the requested columns are decoded. GDAL skips attribute filters
+    # on columns it has been told to ignore, so with a filter the columns
+    # are selected after the read instead.
+    if columns is not None and where is None:
+        sub["columns"] = list(columns)
 
     # Parse the subset_by argument to figure out what it should represent
     # If subset_by is a tuple, it becomes bbox
     if subset_by is not None:
         if type(subset_by) is tuple:
-            sub = {"bbox": subset_by}
+            sub["bbox"] = subset_by
         # If subset_by is an integer or slice, it becomes rows
         elif type(subset_by) is int or type(subset_by) is slice:
-            sub = {"rows": subset_by}
+            sub["rows"] = subset_by
         # If subset_by is a GeoDataFrame or GeoSeries, use mask
         # CRS conflicts should be resolved internally by geopandas
         elif type(subset_by) is gp.GeoDataFrame or type(subset_by) is gp.GeoSeries:
-            sub = {"mask": subset_by}
+            sub["mask"] = _dissolve_mask(subset_by)
         # If subset_by is a dict, it should be of format address: buffer, with the 
         # buffer specified in meters
         elif type(subset_by) is dict:
-            # We need to iterate through the key/value pairs, geocoding 
-            # each one
-            buffers = []
+            # We need to iterate through the key/value pairs, geocoding
+            # each one; the points are then projected and buffered together
+            # so the CRS transformation only happens once
+            points = []
+            distances = []
             for i, j in subset_by.items():
                 g = geocode(address = i, as_gdf = True, limit = 1)
-                g_buffer = g.to_crs('ESRI:102010').buffer(distance = j)
-                buffers.append(g_buffer)
-            
-            buffer_gdf = pd.concat(buffers)
+                points.append(g)
+                distances.extend([j] * g.shape[0])
+
+            points_gdf = pd.concat(points, ignore_index = True)
 
-            sub = {"mask": buffer_gdf}
+            buffer_gdf = points_gdf.to_crs('ESRI:102010').buffer(distance = np.array(distances))
+
+            sub["mask"] = _dissolve_mask(buffer_gdf)
+
+
+    _start_warmup()
+
+    if format == "parquet":
+        # GeoParquet copies are read whole, then subset in memory
+        if cache:
+            # Downloaded copies are kept apart from the GeoParquet copies
+            # written next to cached shapefiles, which share their names
+            cache_dir = os.path.join(appdirs.user_cache_dir("pygris"), "mirror")
+
+            os.makedirs(cache_dir, exist_ok = True)
+
+            source = os.path.join(cache_dir, os.path.basename(url))
+
+            if not os.path.isfile(source):
+                _download_file(url, source)
+            else:
+                _refresh_cached(url, source)
+        else:
+            source = io.BytesIO(_download_bytes(url))
 
+        tiger_data = _read_parquet(source, sub)
+    elif not cache:
+        # The zipped file may already have been downloaded by the caller
+        if content is None:
+            content = _download_bytes(url)
 
-    if not cache:
-        if subset_by is not None:
-            tiger_data = gp.read_file(url, **sub)
+        # pyogrio can read the zipped bytes directly, handing them to GDAL's
+        # in-memory /vsimem/ filesystem, so nothing is unzipped to disk or
+        # copied into an extra buffer; fiona needs a file-like object
+        if _ENGINE == "pyogrio":
+            tiger_bytes = content
         else:
-            tiger_data = gp.read_file(url)
+            tiger_bytes = io.BytesIO(content)
 
-        return tiger_data
+        tiger_data = gp.read_file(tiger_bytes, **_READ_OPTIONS, **sub)
     else:
         cache_dir = appdirs.user_cache_dir("pygris")
 
-        if not os.path.isdir(cache_dir):
-            os.makedirs(cache_dir) 
+        # Several files may be loaded at once on worker threads
+        os.makedirs(cache_dir, exist_ok = True)
 
         basename = os.path.basename(url)
 
         out_file = os.path.join(cache_dir, basename)
-        
-        # If the file doesn't exist, you'll need to download it
-        # and write it to the cache directory
-        if not os.path.isfile(out_file):
-            req = requests.get(url = url)
-
-            with open(out_file, 'wb') as fd:
-                fd.write(req.content)
-        
-        # Now, read in the file from the cache directory
-        if subset_by is not None:
-            tiger_data = gp.read_file(out_file, **sub)
+
+        parquet_file = os.path.splitext(out_file)[0] + ".parquet"
+
+        # If the file has changed on the server since it was cached, the
+        # new version replaces it and the GeoParquet copy is dropped
+        if os.path.isfile(out_file) and _refresh_cached(url, out_file):
+            if os.path.isfile(parquet_file):
+                os.remove(parquet_file)
+
+        # Layers read whole in a previous session are kept as a GeoParquet
+        # copy, which later reads (subset or not) use instead of parsing
+        # the shapefile again
+        if _PARQUET and os.path.isfile(parquet_file):
+            tiger_data = _read_parquet(parquet_file, sub)
         else:
-            tiger_data = gp.read_file(out_file)
+            # If the file doesn't exist, you'll need to download it
+            # and write it to the cache directory
+            if not os.path.isfile(out_file):
+                _download_file(url, out_file)
+            
+            # Now, read in the file from the cache directory
+            tiger_data = gp.read_file(out_file, **_READ_OPTIONS, **sub)
+
+            if _PARQUET and not sub:
+                tiger_data.to_parquet(parquet_file, **_PARQUET_WRITE_OPTIONS)
+
+    if columns is not None:
+        tiger_data = _select_columns(tiger_data, columns)
+
+    if subset_key is not None:
+        with _GDF_CACHE_LOCK:
+            _GDF_CACHE[key] = tiger_data
+
+            if len(_GDF_CACHE) > _GDF_CACHE_SIZE:
+                _GDF_CACHE.popitem(last = False)
+
+        return tiger_data.copy()
+
+    return tiger_data
+
+def _fetch_many(urls, cache = False, subset_by = None, workers = 8, format = "shp",
+                columns = None):
+    # Load several TIGER files at once on a thread pool; downloads and
+    # GDAL reads release the GIL, so these overlap. Results are returned
+    # in the same order as the input URLs, and a URL listed more than once
+    # is only loaded once.
+    if len(urls) == 1:
+        return [_load_tiger(urls[0], cache = cache, subset_by = subset_by, format = format,
+                            columns = columns)]
+
+    unique_urls = list(dict.fromkeys(urls))
+
+    with ThreadPoolExecutor(max_workers = min(workers, len(unique_urls))) as executor:
+        loaded = dict(zip(unique_urls, executor.map(
+            lambda url: _load_tiger(url, cache = cache, subset_by = subset_by,
+                                    format = format, columns = columns), unique_urls)))
+
+    return [loaded[url] for url in urls]
+
+
+async def _fetch_many_async(urls, cache = False, subset_by = None, max_connections = 16):
+    # Async counterpart to _fetch_many(). Uncached files are downloaded
+    # together on one HTTP/2 httpx.AsyncClient, and each is parsed on a
+    # worker thread so the event loop stays free. Cached files, and all
+    # files without httpx, are loaded with _load_tiger() on worker threads.
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_connections)
+
+    def read(url, content = None):
+        return loop.run_in_executor(None, functools.partial(_load_tiger, url, cache = cache,
+                                                            subset_by = subset_by, content = content))
+
+    unique_urls = list(dict.fromkeys(urls))
+
+    if cache or not _HTTPX:
+        async def load(url):
+            async with semaphore:
+                return await read(url)
+
+        loaded = await asyncio.gather(*[load(url) for url in unique_urls])
+    else:
+        import httpx
+
+        async with httpx.AsyncClient(http2 = True, follow_redirects = True,
+                                     timeout = httpx.Timeout(_READ_TIMEOUT, connect = _CONNECT_TIMEOUT),
+                                     headers = {"Accept-Encoding": "identity"},
+                                     limits = httpx.Limits(max_connections = max_connections)) as client:
+            async def load(url):
+                async with semaphore:
+                    response = await client.get(url)
+
+                # Error responses are retried through _load_tiger(), which
+                # falls back to FTP or reports a missing file
+                if not response.is_success:
+                    return await read(url)
+
+                return await read(url, response.content)
+
+            loaded = await asyncio.gather(*[load(url) for url in unique_urls])
+
+    # A URL listed more than once is only loaded once
+    loaded = dict(zip(unique_urls, loaded))
+
+    return [loaded[url] for url in urls]
+
+
+def _as_list(x):
+    # Accept a single value or any list-like of values (a list, tuple, set,
+    # numpy array or pandas Index or Series) and return a plain list
+    if isinstance(x, (list, tuple, set, np.ndarray, pd.Index, pd.Series)):
+        return list(x)
+
+    return [x]
+
+
+def _county_urls(fn, kind, state, county, year, subset_by = None):
+    # Resolve the year, state and counties for a county-level layer and
+    # build the URL of each county's file. A single county is handled as
+    # a list of one, so both cases share the same download code.
+    year = _resolve_year(fn, year)
+
+    state = validate_state(state)
+
+    valid_county = validate_county_many(state, _as_list(county))
+
+    # With several counties and a bounding box or geometry to subset to,
+    # counties that miss it are skipped rather than downloaded only to be
+    # filtered to nothing. This needs the full TIGER/Line county layer (the
+    # cartographic boundary one is clipped to the shoreline, and county
+    # water extends past it), which is only worth reading when it has
+    # already been loaded this session or is in the cache directory.
+    if len(valid_county) > 1 and isinstance(subset_by, (tuple, gp.GeoDataFrame, gp.GeoSeries)):
+        valid_county = _counties_touching(state, valid_county, year, subset_by)
+
+    url = _tiger_template(kind, year)
+
+    return [url(year = year, state = state, county = i) for i in valid_county]
+
+
+def _session_counties(state, year):
+    # The state's counties from the TIGER/Line county layer if it has been
+    # read this session, whole or filtered to states including this one,
+    # or None
+    url = f"{_CENSUS_HTTPS}geo/tiger/TIGER{year}/COUNTY/tl_{year}_us_county.zip"
+
+    with _GDF_CACHE_LOCK:
+        layers = [gdf for (key_url, where, columns, subset_key), gdf in _GDF_CACHE.items()
+                  if key_url == url and columns is None and subset_key == ()]
+
+    for gdf in layers:
+        state_counties = gdf[gdf["STATEFP"] == state]
+
+        if len(state_counties) > 0:
+            return state_counties
+
+    return None
+
+
+def _county_layer_cached(year):
+    # Whether the national TIGER/Line county file for a year has already
+    # been downloaded to the cache directory
+    name = f"tl_{year}_us_county.zip"
+
+    return os.path.isfile(os.path.join(appdirs.user_cache_dir("pygris"), name))
+
+
+def _counties_touching(state, valid_county, year, subset_by):
+    # The counties of valid_county whose TIGER/Line boundaries intersect a
+    # bounding box tuple or a GeoDataFrame or GeoSeries, or all of them if
+    # the county layer is neither in memory nor on disk. The first county
+    # is kept if none intersect, so that the result still has the layer's
+    # columns. Geometries without a CRS are taken to be in the layer's
+    # own, as they are when read with a mask.
+    from pygris.enumeration_units import counties
+
+    if type(subset_by) is tuple:
+        geometry = gp.GeoSeries([box(*subset_by)], crs = _TIGER_CRS)
+    elif subset_by.crs is None:
+        geometry = subset_by.set_crs(_TIGER_CRS)
+    else:
+        geometry = subset_by
+
+    state_counties = _session_counties(state, year)
+
+    if state_counties is None:
+        if not _county_layer_cached(year):
+            return valid_county
+
+        bbox = tuple(geometry.to_crs(_TIGER_CRS).total_bounds)
+
+        state_counties = counties(state = state, year = year, cache = True, subset_by = bbox)
+
+    county_col = [col for col in state_counties.columns if col.startswith("COUNTYFP")][0]
+
+    touching = set(_filter_intersecting(state_counties, geometry)[county_col])
+
+    kept = [i for i in valid_county if i in touching]
+
+    return kept if kept else valid_county[:1]
+
+
+def _concat(frames):
+    # Stack the GeoDataFrames from several downloads into one
+    return pd.concat(frames, **_CONCAT_OPTIONS)
 
-        return tiger_data         
 
 def fips_codes():
     path = fips_path()
 
     return pd.read_csv(path, dtype = 'object')
 
+
+@functools.lru_cache(maxsize = None)
+def _fips_index():
+    # Dictionaries built once from the FIPS codes table, so that state and
+    # county validation are plain lookups rather than DataFrame queries:
+    # lowercase postal codes and state names to state codes, and for each
+    # state, county names to county codes (in table order) and lowercase
+    # county names to the names as written
+    fips = fips_codes()
+
+    states = fips.drop_duplicates('state_code')
+
+    postal = dict(zip(states.state.str.lower(), states.state_code))
+    names = dict(zip(states.state_name.str.lower(), states.state_code))
+
+    counties = {}
+    county_names = {}
+    for state_code, county_name, county_code in zip(fips.state_code, fips.county, fips.county_code):
+        counties.setdefault(state_code, {}).setdefault(county_name, county_code)
+        county_names.setdefault(state_code, {}).setdefault(county_name.lower(), county_name)
+
+    return postal, names, counties, county_names
+
+
+# Validation results are memoized, since the same states and counties
+# tend to be looked up over and over again in loops and notebooks
+@functools.lru_cache(maxsize = None)
 def validate_state(state, quiet = False):
     # Standardize as lowercase
     original_input = state
@@ -90,72 +938,84 @@ def validate_state(state, quiet = False):
         # Return the result
         return state
     else:
-        # Get the FIPS codes dataset
-        fips = fips_codes()
-        # If a state abbreviation, use the state postal code
+        postal, names, _, _ = _fips_index()
+        # If a state abbreviation, use the state postal code; 
+        # otherwise, look up the state name
         if len(state) == 2:
-            fips['postal_lower'] = fips.state.str.lower()
-            state_sub = fips.query('postal_lower == @state')
+            state_fips = postal.get(state)
+        else:
+            state_fips = names.get(state)
 
-            if state_sub.shape[0] == 0:
-                raise ValueError("You have likely entered an invalid state code, please revise.")
-            else:
-                state_fips = state_sub.state_code.unique()[0]
-                
-                if not quiet:
-                    print(f"Using FIPS code '{state_fips}' for input '{original_input}'")
+        if state_fips is None:
+            raise ValueError("You have likely entered an invalid state code, please revise.")
 
-                return state_fips
-        else:
-            # If a state name, grab the appropriate info from fips_codes
-            fips['name_lower'] = fips.state_name.str.lower()
-            state_sub = fips.query('name_lower == @state')
+        if not quiet:
+            logger.info("Using FIPS code '%s' for input '%s'", state_fips, original_input)
 
-            if state_sub.shape[0] == 0:
-                raise ValueError("You have likely entered an invalid state code, please revise.")
-            else:
-                state_fips = state_sub.state_code.unique()[0]
+        return state_fips
 
-                if not quiet:
-                    print(f"Using FIPS code '{state_fips}' for input '{original_input}'")
-                
-                return state_fips
-            
 
-def validate_county(state, county, quiet = False):
-    state = validate_state(state)
+def validate_state_many(states, quiet = False):
+    # Vectorized counterpart to validate_state() for a list of inputs:
+    # normalize everything at once and resolve it with a single lookup
+    # against the FIPS codes index
+    inputs = pd.Series([str(x) for x in states], dtype = 'object').str.strip().str.lower()
 
-    fips = fips_codes()
+    postal, names, _, _ = _fips_index()
+
+    # Both postal codes and full state names map to the state FIPS code
+    lookup = {**postal, **names}
+
+    is_code = inputs.str.isdigit()
+
+    state_fips = inputs.map(lookup)
+    state_fips[is_code] = inputs[is_code].str.zfill(2)
+
+    if state_fips.isna().any():
+        raise ValueError("You have likely entered an invalid state code, please revise.")
 
-    county_table = fips.query('state_code == @state')
+    if not quiet:
+        for original_input, code, numeric in zip(states, state_fips, is_code):
+            if not numeric:
+                logger.info("Using FIPS code '%s' for input '%s'", code, original_input)
+
+    return state_fips.tolist()
+
+
+@functools.lru_cache(maxsize = None)
+def validate_county(state, county, quiet = False):
+    state = validate_state(state)
 
     # If they used numbers for the county:
     if county.isdigit():
         # Left-pad with zeroes
-        county.zfill(3)
-        
-        return county
+        return county.zfill(3)
     
     # Otherwise, if they pass a name:
     else:
-        # Find counties in the table that could match
-        county_sub = county_table.query('county.str.contains(@county, flags = @re.IGNORECASE, regex = True)',
-                                        engine = 'python')
+        _, _, counties, county_names = _fips_index()
+        county_table = counties.get(state, {})
+
+        # An exact (case-insensitive) name match is a single dict lookup
+        # and settles it straight away; otherwise, find counties that could
+        # match using a plain case-insensitive substring test
+        county_lower = county.lower()
 
-        possible_counties = county_sub.county.unique()
+        exact = county_names.get(state, {}).get(county_lower)
+
+        if exact is not None:
+            possible_counties = [exact]
+        else:
+            possible_counties = [x for x in county_table if county_lower in x.lower()]
 
         if len(possible_counties) == 0:
             raise ValueError("No county names match your input country string.")
         elif len(possible_counties) == 1:
 
-            cty_code = (county_sub
-                .query('county == @possible_counties[0]')
-                .county_code
-                .unique()[0]
-            )            
+            cty_code = county_table[possible_counties[0]]
 
             if not quiet:
-                print(f"Using FIPS code '{cty_code}' for input '{county}'")
+                logger.info("Using FIPS code '%s' for input '%s'", cty_code, county)
 
             return cty_code
         else:
@@ -164,4 +1024,33 @@ def validate_county(state, county, quiet = False):
             raise ValueError(msg)   
 
 
+def validate_county_many(state, counties, quiet = False):
+    # Vectorized counterpart to validate_county() for a list of inputs:
+    # county codes are padded and exact names resolved with a single
+    # mapping against the FIPS codes index; inputs that match neither go
+    # through validate_county() for its partial matching
+    state = validate_state(state)
+
+    _, _, county_table, county_names = _fips_index()
+    table = county_table.get(state, {})
+    lookup = {lower: table[name] for lower, name in county_names.get(state, {}).items()}
+
+    inputs = pd.Series([str(x) for x in counties], dtype = 'object')
+
+    is_code = inputs.str.isdigit()
+
+    # Kept as object dtype, as the mapping comes back float when no names match
+    county_fips = inputs.str.lower().map(lookup).astype('object')
+    county_fips[is_code] = inputs[is_code].str.zfill(3)
+
+    partial = county_fips.isna()
+
+    if partial.any():
+        county_fips[partial] = [validate_county(state, x, quiet) for x in inputs[partial]]
+
+    if not quiet:
+        for original_input, code, numeric, matched in zip(counties, county_fips, is_code, partial):
+            if not numeric and not matched:
+                logger.info("Using FIPS code '%s' for input '%s'", code, original_input)
 
+    return county_fips.tolist()
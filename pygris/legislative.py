@@ -2,10 +2,26 @@
 
 __author__ = "Kyle Walker <kyle@walker-data.com"
 
-from pygris.helpers import _load_tiger, validate_state, validate_county
+from pygris.helpers import logger, _resolve_year, _load_tiger, _fetch_many, _where_in, _filter_intersecting, _concat, validate_state, validate_state_many, validate_county, validate_county_many
+from pygris._urls import _build_tiger_url
+
+# Accepted values for the resolution and house arguments
+_VALID_RES = frozenset({"500k", "5m", "20m"})
+_VALID_HOUSE = frozenset({"upper", "lower"})
+
+# The Congress whose districts are published for each TIGER/Line year
+_YEAR_TO_CONGRESS = {
+    2010: "111",
+    2011: "112", 2012: "112",
+    2013: "113",
+    2014: "114", 2015: "114",
+    2016: "115", 2017: "115",
+    2018: "116", 2019: "116", 2020: "116", 2021: "116", 2022: "116"
+}
 
 def congressional_districts(state = None, cb = False, resolution = "500k", year = None,
-                            cache = False, subset_by = None):
+                            cache = False, subset_by = None, format = "shp",
+                            columns = None):
 
     """
     Load a congressional districts shapefile into Python as a GeoDataFrame
@@ -46,6 +62,13 @@ def congressional_districts(state = None, cb = False, resolution = "500k", year
             * A dict of format {"address": "buffer_distance"} will return rows
             that intersect a buffer of a given distance (in meters) around an 
             input address.  
+    format : str
+        The file format to download. "shp" (the default) reads the zipped shapefile 
+        from the Census website; "parquet" reads a GeoParquet copy of the same file 
+        from the mirror set in the PYGRIS_PARQUET_MIRROR environment variable.
+    columns : list
+        An optional list of the attribute columns to keep; the geometry column is 
+        always returned. If None (the default), all columns are returned.
 
     Returns
     ----------
@@ -59,61 +82,48 @@ def congressional_districts(state = None, cb = False, resolution = "500k", year
 
     """
 
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
+    year = _resolve_year("congressional_districts", year)
     
     if cb and year < 2013:
         raise ValueError("`cb = True` for congressional districts is unavailable prior to 2013.")
 
-    if resolution not in ['500k', '5m', '20m']:
+    if resolution not in _VALID_RES:
         raise ValueError("Invalid value for resolution. Valid values are '500k', '5m', and '20m'.")
 
-    if year in range(2018, 2023):
-        congress = "116"
-    elif year in [2016, 2017]:
-        congress = "115"
-    elif year in [2014, 2015]:
-        congress = "114"
-    elif year == 2013:
-        congress = "113"
-    elif year in [2011, 2012]:
-        congress = "112"
-    elif year == 2010:
-        congress = "111"
-    else:
+    congress = _YEAR_TO_CONGRESS.get(year)
+
+    if congress is None:
         raise ValueError(f"Congressional districts are not available from pygris for {year}.")
     
-    if cb:
-        if year == 2013:
-            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/cb_{year}_us_cd{congress}_{resolution}.zip"
-        else:
-            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_cd{congress}_{resolution}.zip"
-    else:
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/CD/tl_{year}_us_cd{congress}.zip"
-    
+    if state is not None and not isinstance(state, list):
+        state = [state]
 
-    cds = _load_tiger(url, cache = cache, subset_by = subset_by)
+    # The national file is filtered to the requested states as it is read,
+    # so that one state and several states come from the same file
+    where = None
 
     if state is not None:
-        if type(state) is not list:
-            state = [state]
-        valid_state = [validate_state(x) for x in state]
-        cds = cds.query('STATEFP in @valid_state')
+        valid_state = validate_state_many(state)
+        where = _where_in("STATEFP", valid_state)
+
+    url = _build_tiger_url("cd", year, cb = cb, resolution = resolution, congress = congress)
+
+    cds = _load_tiger(url, cache = cache, subset_by = subset_by, where = where, format = format, columns = columns)
 
     return cds
         
 
 def state_legislative_districts(state = None, house = "upper", cb = False,
-                                year = None, cache = False, subset_by = None):
+                                year = None, cache = False, subset_by = None, format = "shp",
+                                columns = None):
     """
     Load a state legislative districts shapefile into Python as a GeoDataFrame
 
     Parameters
     ----------
-    state : str 
-        The state name, state abbreviation, or two-digit FIPS code of the desired state. 
-        If None, state legislative districts for the entire United States
+    state : str or list
+        The state name, state abbreviation, or two-digit FIPS code of the desired state, 
+        or a list of such states. If None, state legislative districts for the entire United States
         will be downloaded when cb is True and the year is 2019 or later.  
     house : str 
         Specify here whether you want boundaries for the "upper" or "lower" house. 
@@ -144,6 +154,13 @@ def state_legislative_districts(state = None, house = "upper", cb = False,
             * A dict of format {"address": "buffer_distance"} will return rows
             that intersect a buffer of a given distance (in meters) around an 
             input address.  
+    format : str
+        The file format to download. "shp" (the default) reads the zipped shapefile 
+        from the Census website; "parquet" reads a GeoParquet copy of the same file 
+        from the mirror set in the PYGRIS_PARQUET_MIRROR environment variable.
+    columns : list
+        An optional list of the attribute columns to keep; the geometry column is 
+        always returned. If None (the default), all columns are returned.
 
     Returns
     ----------
@@ -157,52 +174,64 @@ def state_legislative_districts(state = None, house = "upper", cb = False,
 
     """
     
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
+    year = _resolve_year("state_legislative_districts", year)
     
 
     if state is None:
         if year > 2018 and cb:
             state = "us"
-            print("Retrieving state legislative districts for the entire United States.")
+            logger.info("Retrieving state legislative districts for the entire United States.")
         else:
             raise ValueError("A state must be specified for this year/dataset combination.")
+    elif isinstance(state, list):
+        state = validate_state_many(state)
     else:
         state = validate_state(state)
 
-    if house not in ["upper", "lower"]:
+    if house not in _VALID_HOUSE:
         raise ValueError("You must specify either 'upper' or 'lower' as an argument for house.")
     
     if house == "lower":
-        type = "sldl"
+        district_type = "sldl"
     else:
-        type = "sldu"
+        district_type = "sldu"
 
-    
+    # A list of states is fetched concurrently, one file per state
+    if isinstance(state, list):
+        urls = [_state_legislative_url(x, district_type, cb, year) for x in state]
+
+        stateleg = _concat(_fetch_many(urls, cache = cache, subset_by = subset_by, format = format, columns = columns))
+    else:
+        url = _state_legislative_url(state, district_type, cb, year)
+
+        stateleg = _load_tiger(url, cache = cache, subset_by = subset_by, format = format, columns = columns)
+
+    return stateleg
+
+
+def _state_legislative_url(state, district_type, cb, year):
     if cb:
         if year == 2010:
-            if type == "sldu":
+            if district_type == "sldu":
                 url = f"https://www2.census.gov/geo/tiger/GENZ2010/gz_2010_{state}_610_u2_500k.zip"
-            elif type == "sldl":
+            elif district_type == "sldl":
                 url = f"https://www2.census.gov/geo/tiger/GENZ2010/gz_2010_{state}_620_l2_500k.zip"
         elif year == 2013:
-            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/cb_{year}_{state}_{type}_500k.zip"
+            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/cb_{year}_{state}_{district_type}_500k.zip"
         else:
-            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_{state}_{type}_500k.zip"
+            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_{state}_{district_type}_500k.zip"
     else:
         if year in [2000, 2010]:
-            url = f"https://www2.census.gov/geo/tiger/TIGER2010/{type.upper()}/{year}/tl_2010_{state}_{type}{str(year)[2:]}.zip"
+            url = f"https://www2.census.gov/geo/tiger/TIGER2010/{district_type.upper()}/{year}/tl_2010_{state}_{district_type}{str(year)[2:]}.zip"
         else:
-            url = f"https://www2.census.gov/geo/tiger/TIGER{year}/{type.upper()}/tl_{year}_{state}_{type}.zip"
+            url = f"https://www2.census.gov/geo/tiger/TIGER{year}/{district_type.upper()}/tl_{year}_{state}_{district_type}.zip"
 
-    stateleg = _load_tiger(url, cache = cache, subset_by = subset_by)
-
-    return stateleg
+    return url
 
     
 def voting_districts(state = None, county = None, cb = False,
-                     year = 2020, cache = False, subset_by = None):
+                     year = 2020, cache = False, subset_by = None, format = "shp",
+                     county_geometry = None, columns = None):
     """
      Load a voting districts shapefile into Python as a GeoDataFrame
 
@@ -212,9 +241,9 @@ def voting_districts(state = None, county = None, cb = False,
         The state name, state abbreviation, or two-digit FIPS code of the desired state. 
         If None, voting districts for the entire United States
         will be downloaded when cb is True and the year is 2020.  
-    county : str 
-        The county name or three-digit FIPS code of the desired county. If None, voting
-        districts for the selected state will be downloaded. 
+    county : str or list
+        The county name or three-digit FIPS code of the desired county, or a list of such 
+        counties. If None, voting districts for the selected state will be downloaded. 
     cb : bool 
         If set to True, download a generalized (1:500k) cartographic boundary file.  
         Defaults to False (the regular TIGER/Line file).
@@ -241,6 +270,17 @@ def voting_districts(state = None, county = None, cb = False,
             * A dict of format {"address": "buffer_distance"} will return rows
             that intersect a buffer of a given distance (in meters) around an 
             input address.  
+    format : str
+        The file format to download. "shp" (the default) reads the zipped shapefile 
+        from the Census website; "parquet" reads a GeoParquet copy of the same file 
+        from the mirror set in the PYGRIS_PARQUET_MIRROR environment variable.
+    county_geometry : geopandas.GeoSeries or geopandas.GeoDataFrame
+        Optional county (or other) geometries; if supplied, only voting districts
+        that intersect them are returned. CRS misalignment will be resolved 
+        internally.
+    columns : list
+        An optional list of the attribute columns to keep; the geometry column is 
+        always returned. If None (the default), all columns are returned.
 
     Returns
     ----------
@@ -260,7 +300,7 @@ def voting_districts(state = None, county = None, cb = False,
     if state is None:
         if year > 2018 and cb:
             state = "us"
-            print("Retrieving voting districts for the entire United States")
+            logger.info("Retrieving voting districts for the entire United States")
         else:
             raise ValueError("A state must be specified for this year/dataset combination.")
     else:
@@ -270,27 +310,41 @@ def voting_districts(state = None, county = None, cb = False,
     if cb:
         url = f"https://www2.census.gov/geo/tiger/GENZ2020/shp/cb_2020_{state}_vtd_500k.zip"
 
-        vtds = _load_tiger(url, cache = cache, subset_by = subset_by)
+        # Filter to the requested counties as the file is read, so that
+        # the county column needn't be among the columns returned
+        where = None
 
-        if county is None:
-            return vtds
-        else:
-            if type(county) is not list:
+        if county is not None:
+            if not isinstance(county, list):
                 county = [county]
-                valid_county = [validate_county(state, x) for x in county]
-                vtds = vtds.query('COUNTYFP20 in @valid_county')
-            
-            return vtds
+            valid_county = validate_county_many(state, county)
+            where = _where_in("COUNTYFP20", valid_county)
+
+        vtds = _load_tiger(url, cache = cache, subset_by = subset_by, where = where, format = format, columns = columns)
     else:
         if year == 2012:
             url = f"https://www2.census.gov/geo/tiger/TIGER2012/VTD/tl_2012_{state}_vtd10.zip"
+
+            vtds = _load_tiger(url, cache = cache, subset_by = subset_by, format = format, columns = columns)
+        elif isinstance(county, list):
+            # One file per county, fetched concurrently
+            valid_county = validate_county_many(state, county)
+            urls = [f"https://www2.census.gov/geo/tiger/TIGER2020PL/LAYER/VTD/2020/tl_2020_{state}{x}_vtd20.zip"
+                    for x in valid_county]
+
+            vtds = _concat(_fetch_many(urls, cache = cache, subset_by = subset_by, format = format, columns = columns))
         else:
             if county is not None:
                 county = validate_county(state, county)
                 url = f"https://www2.census.gov/geo/tiger/TIGER2020PL/LAYER/VTD/2020/tl_2020_{state}{county}_vtd20.zip"
             else:
                 url = f"https://www2.census.gov/geo/tiger/TIGER2020PL/LAYER/VTD/2020/tl_2020_{state}_vtd20.zip"
-        
-        vtds = _load_tiger(url, cache = cache, subset_by = subset_by)
 
-        return vtds
\ No newline at end of file
+            vtds = _load_tiger(url, cache = cache, subset_by = subset_by, format = format, columns = columns)
+
+    # Spatial filter against the supplied geometries, through the
+    # districts' spatial index
+    if county_geometry is not None:
+        vtds = _filter_intersecting(vtds, county_geometry)
+
+    return vtds
\ No newline at end of file
@@ -2,9 +2,14 @@
 
 __author__ = "Kyle Walker <kyle@walker-data.com"
 
-from pygris.helpers import _load_tiger
+from pygris.helpers import _resolve_year, _load_tiger
+from pygris._urls import _build_tiger_url
 
-def core_based_statistical_areas(cb = False, resolution = "500k", year = None, cache = False):
+# Accepted values for the resolution argument
+_VALID_RES = frozenset({"500k", "5m", "20m"})
+
+def core_based_statistical_areas(cb = False, resolution = "500k", year = None, cache = False, format = "shp",
+                                 columns = None):
     """
     Load a core-based statistical areas shapefile into Python as a GeoDataFrame
 
@@ -24,6 +29,13 @@ def core_based_statistical_areas(cb = False, resolution = "500k", year = None, c
         If True, the function will download a Census shapefile to a cache directory 
         on the user's computer for future access.  If False, the function will load
         the shapefile directly from the Census website.  
+    format : str
+        The file format to download. "shp" (the default) reads the zipped shapefile 
+        from the Census website; "parquet" reads a GeoParquet copy of the same file 
+        from the mirror set in the PYGRIS_PARQUET_MIRROR environment variable.
+    columns : list
+        An optional list of the attribute columns to keep; the geometry column is 
+        always returned. If None (the default), all columns are returned.
 
     Returns
     ----------
@@ -37,37 +49,25 @@ def core_based_statistical_areas(cb = False, resolution = "500k", year = None, c
 
 
     """
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
-    
-    if resolution not in ["500k", "5m", "20m"]:
+
+    year = _resolve_year("core_based_statistical_areas", year)
+
+    if resolution not in _VALID_RES:
         raise ValueError("Invalid value for resolution. Valid values are '500k', '5m', and '20m'.")
 
     if year == 2022:
         raise ValueError("CBSAs for 2022 are not yet defined due to the re-organization of counties in Connecticut.")
     
-    if cb:
-        if year == 2010:
-            if resolution == "5m":
-                raise ValueError("`resolution = '5m' is unavailable for 2010.")
-            
-            url = f"https://www2.census.gov/geo/tiger/GENZ2010/gz_2010_us_310_m1_{resolution}.zip"
-        else:
-            if year == 2013:
-                url = f"https://www2.census.gov/geo/tiger/GENZ{year}/cb_{year}_us_cbsa_{resolution}.zip"
-            else:
-                url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_cbsa_{resolution}.zip"
-    else:
-        if year == 2010:
-            url = f"https://www2.census.gov/geo/tiger/TIGER2010/CBSA/2010/tl_2010_us_cbsa10.zip"
-        else:
-            url = f"https://www2.census.gov/geo/tiger/TIGER{year}/CBSA/tl_{year}_us_cbsa.zip"
+    if cb and year == 2010 and resolution == "5m":
+        raise ValueError("`resolution = '5m' is unavailable for 2010.")
+
+    url = _build_tiger_url("cbsa", year, cb = cb, resolution = resolution)
     
-    return _load_tiger(url, cache = cache)
+    return _load_tiger(url, cache = cache, format = format, columns = columns)
 
 
-def urban_areas(cb = False, year = None, cache = False):
+def urban_areas(cb = False, year = None, cache = False, format = "shp",
+                columns = None):
     """
     Load a urbanized areas shapefile into Python as a GeoDataFrame
 
@@ -83,6 +83,13 @@ def urban_areas(cb = False, year = None, cache = False):
         If True, the function will download a Census shapefile to a cache directory 
         on the user's computer for future access.  If False, the function will load
         the shapefile directly from the Census website.  
+    format : str
+        The file format to download. "shp" (the default) reads the zipped shapefile 
+        from the Census website; "parquet" reads a GeoParquet copy of the same file 
+        from the mirror set in the PYGRIS_PARQUET_MIRROR environment variable.
+    columns : list
+        An optional list of the attribute columns to keep; the geometry column is 
+        always returned. If None (the default), all columns are returned.
 
     Returns
     ----------
@@ -96,22 +103,16 @@ def urban_areas(cb = False, year = None, cache = False):
 
 
     """
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
-    
-    if cb:
-        if year == 2013:
-            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/cb_{year}_us_ua10_500k.zip"
-        else:
-            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_ua10_500k.zip"
-    else:
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/UAC/tl_{year}_us_uac10.zip"
+
+    year = _resolve_year("urban_areas", year)
+
+    url = _build_tiger_url("ua", year, cb = cb)
     
-    return _load_tiger(url, cache = cache)
+    return _load_tiger(url, cache = cache, format = format, columns = columns)
 
 
-def combined_statistical_areas(cb = False, resolution = "500k", year = None, cache = False):
+def combined_statistical_areas(cb = False, resolution = "500k", year = None, cache = False, format = "shp",
+                               columns = None):
     """
     Load a combined statistical areas shapefile into Python as a GeoDataFrame
 
@@ -131,6 +132,13 @@ def combined_statistical_areas(cb = False, resolution = "500k", year = None, cac
         If True, the function will download a Census shapefile to a cache directory 
         on the user's computer for future access.  If False, the function will load
         the shapefile directly from the Census website.  
+    format : str
+        The file format to download. "shp" (the default) reads the zipped shapefile 
+        from the Census website; "parquet" reads a GeoParquet copy of the same file 
+        from the mirror set in the PYGRIS_PARQUET_MIRROR environment variable.
+    columns : list
+        An optional list of the attribute columns to keep; the geometry column is 
+        always returned. If None (the default), all columns are returned.
 
     Returns
     ----------
@@ -143,25 +151,19 @@ def combined_statistical_areas(cb = False, resolution = "500k", year = None, cac
 
 
     """
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
-    
-    if resolution not in ["500k", "5m", "20m"]:
+
+    year = _resolve_year("combined_statistical_areas", year)
+
+    if resolution not in _VALID_RES:
         raise ValueError("Invalid value for resolution. Valid values are '500k', '5m', and '20m'.")
     
-    if cb:
-        if year == 2013:
-            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/cb_{year}_us_csa_{resolution}.zip"
-        else:
-            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_csa_{resolution}.zip"
-    else:
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/CSA/tl_{year}_us_csa.zip"
+    url = _build_tiger_url("csa", year, cb = cb, resolution = resolution)
     
-    return _load_tiger(url, cache = cache)
+    return _load_tiger(url, cache = cache, format = format, columns = columns)
 
 
-def metro_divisions(cb = False, resolution = "500k", year = None, cache = False):
+def metro_divisions(cb = False, resolution = "500k", year = None, cache = False, format = "shp",
+                    columns = None):
     """
     Load a metropolitan divisions shapefile into Python as a GeoDataFrame
 
@@ -181,6 +183,13 @@ def metro_divisions(cb = False, resolution = "500k", year = None, cache = False)
         If True, the function will download a Census shapefile to a cache directory 
         on the user's computer for future access.  If False, the function will load
         the shapefile directly from the Census website.  
+    format : str
+        The file format to download. "shp" (the default) reads the zipped shapefile 
+        from the Census website; "parquet" reads a GeoParquet copy of the same file 
+        from the mirror set in the PYGRIS_PARQUET_MIRROR environment variable.
+    columns : list
+        An optional list of the attribute columns to keep; the geometry column is 
+        always returned. If None (the default), all columns are returned.
 
     Returns
     ----------
@@ -193,33 +202,30 @@ def metro_divisions(cb = False, resolution = "500k", year = None, cache = False)
 
 
     """
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
-    
-    if resolution not in ["500k", "5m", "20m"]:
+
+    year = _resolve_year("metro_divisions", year)
+
+    if resolution not in _VALID_RES:
         raise ValueError("Invalid value for resolution. Valid values are '500k', '5m', and '20m'.")
 
     if year == 2022:
         raise ValueError("Metropolitan divisions for 2022 are not yet defined due to the re-organization of counties in Connecticut.")
     
-    if cb:
-        if year == 2013:
-            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/cb_{year}_us_metdiv_{resolution}.zip"
-        else:
-            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_metdiv_{resolution}.zip"
-    else:
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/METDIV/tl_{year}_us_metdiv.zip"
+    url = _build_tiger_url("metdiv", year, cb = cb, resolution = resolution)
     
-    return _load_tiger(url, cache = cache)
+    return _load_tiger(url, cache = cache, format = format, columns = columns)
 
 
-def new_england(type = "necta", cb = False, year = None, cache = False):
+def new_england(necta_type = "necta", cb = False, year = None, cache = False, format = "shp",
+                columns = None, type = None):
     """
     Load a metropolitan divisions shapefile into Python as a GeoDataFrame
 
     Parameters
     ----------
+    necta_type : str
+        The type of NECTA boundaries to download: "necta" (the default), 
+        "combined", or "divisions". The older keyword `type` is still accepted.
     cb : bool 
         If set to True, download a generalized (1:500k) cartographic boundary file.  
         Defaults to False (the regular TIGER/Line file).
@@ -234,6 +240,13 @@ def new_england(type = "necta", cb = False, year = None, cache = False):
         If True, the function will download a Census shapefile to a cache directory 
         on the user's computer for future access.  If False, the function will load
         the shapefile directly from the Census website.  
+    format : str
+        The file format to download. "shp" (the default) reads the zipped shapefile 
+        from the Census website; "parquet" reads a GeoParquet copy of the same file 
+        from the mirror set in the PYGRIS_PARQUET_MIRROR environment variable.
+    columns : list
+        An optional list of the attribute columns to keep; the geometry column is 
+        always returned. If None (the default), all columns are returned.
 
     Returns
     ----------
@@ -246,27 +259,26 @@ def new_england(type = "necta", cb = False, year = None, cache = False):
 
 
     """
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
+
+    year = _resolve_year("new_england", year)
+
+    if type is not None:
+        necta_type = type
     
-    if type == "necta":
-        if cb:
-            url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_necta_500k.zip"
-        else:
-            url = f"https://www2.census.gov/geo/tiger/TIGER{year}/NECTA/tl_{year}_us_necta.zip"
+    if necta_type == "necta":
+        url = _build_tiger_url("necta", year, cb = cb)
 
-        return _load_tiger(url, cache = cache)
+        return _load_tiger(url, cache = cache, format = format, columns = columns)
 
-    elif type == "combined":
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/CNECTA/tl_{year}_us_cnecta.zip"
+    elif necta_type == "combined":
+        url = _build_tiger_url("cnecta", year)
 
-        return _load_tiger(url, cache = cache)
+        return _load_tiger(url, cache = cache, format = format, columns = columns)
 
-    elif type == "divisions":
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/NECTADIV/tl_{year}_us_nectadiv.zip"
+    elif necta_type == "divisions":
+        url = _build_tiger_url("nectadiv", year)
 
-        return _load_tiger(url, cache = cache)
+        return _load_tiger(url, cache = cache, format = format, columns = columns)
 
     else:
         raise ValueError("Invalid NECTA type; valid values include 'necta' (the default), 'combined', and 'divisions'.")
@@ -2,9 +2,16 @@
 
 __author__ = "Kyle Walker <kyle@walker-data.com"
 
-from pygris.helpers import _load_tiger
+from pygris.helpers import _resolve_year, _load_tiger
+from pygris._urls import _build_tiger_url
 
-def regions(resolution = "500k", year = None, cache = False):
+# Accepted values for the resolution argument; the nation file
+# has no 1:500k version
+_VALID_RES = frozenset({"500k", "5m", "20m"})
+_VALID_NATION_RES = frozenset({"5m", "20m"})
+
+def regions(resolution = "500k", year = None, cache = False, format = "shp",
+            columns = None):
     """
     Load a US Census regions shapefile into Python as a GeoDataFrame
 
@@ -23,27 +30,33 @@ def regions(resolution = "500k", year = None, cache = False):
         If True, the function will download a Census shapefile to a cache directory 
         on the user's computer for future access.  If False, the function will load
         the shapefile directly from the Census website.  
+    format : str
+        The file format to download. "shp" (the default) reads the zipped shapefile 
+        from the Census website; "parquet" reads a GeoParquet copy of the same file 
+        from the mirror set in the PYGRIS_PARQUET_MIRROR environment variable.
+    columns : list
+        An optional list of the attribute columns to keep; the geometry column is 
+        always returned. If None (the default), all columns are returned.
 
     Returns
     ----------
     geopandas.GeoDataFrame: A GeoDataFrame of US regions.
     """
 
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
-    
-    if resolution not in ["500k", "5m", "20m"]:
+    year = _resolve_year("regions", year)
+
+    if resolution not in _VALID_RES:
         raise ValueError("Invalid value for resolution. Valid values are '500k', '5m', and '20m'.")
 
-    url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_region_{resolution}.zip"
+    url = _build_tiger_url("region", year, cb = True, resolution = resolution)
 
-    rgns = _load_tiger(url, cache = cache)
+    rgns = _load_tiger(url, cache = cache, format = format, columns = columns)
 
     return rgns
 
 
-def nation(resolution = "5m", year = None, cache = False):
+def nation(resolution = "5m", year = None, cache = False, format = "shp",
+           columns = None):
     """
     Load a US national boundary shapefile into Python as a GeoDataFrame
 
@@ -62,27 +75,33 @@ def nation(resolution = "5m", year = None, cache = False):
         If True, the function will download a Census shapefile to a cache directory 
         on the user's computer for future access.  If False, the function will load
         the shapefile directly from the Census website.  
+    format : str
+        The file format to download. "shp" (the default) reads the zipped shapefile 
+        from the Census website; "parquet" reads a GeoParquet copy of the same file 
+        from the mirror set in the PYGRIS_PARQUET_MIRROR environment variable.
+    columns : list
+        An optional list of the attribute columns to keep; the geometry column is 
+        always returned. If None (the default), all columns are returned.
 
     Returns
     ----------
     geopandas.GeoDataFrame: A GeoDataFrame of the US boundary.
     """
 
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
-    
-    if resolution not in ["5m", "20m"]:
-        raise ValueError("Invalid value for resolution. Valid values are '500k', '5m', and '20m'.")
+    year = _resolve_year("nation", year)
+
+    if resolution not in _VALID_NATION_RES:
+        raise ValueError("Invalid value for resolution. Valid values are '5m' and '20m'.")
 
-    url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_nation_{resolution}.zip"
+    url = _build_tiger_url("nation", year, cb = True, resolution = resolution)
 
-    nat = _load_tiger(url, cache = cache)
+    nat = _load_tiger(url, cache = cache, format = format, columns = columns)
 
     return nat
 
 
-def divisions(resolution = "500k", year = None, cache = False):
+def divisions(resolution = "500k", year = None, cache = False, format = "shp",
+              columns = None):
     """
     Load a US Census divisions shapefile into Python as a GeoDataFrame
 
@@ -101,21 +120,26 @@ def divisions(resolution = "500k", year = None, cache = False):
         If True, the function will download a Census shapefile to a cache directory 
         on the user's computer for future access.  If False, the function will load
         the shapefile directly from the Census website.  
+    format : str
+        The file format to download. "shp" (the default) reads the zipped shapefile 
+        from the Census website; "parquet" reads a GeoParquet copy of the same file 
+        from the mirror set in the PYGRIS_PARQUET_MIRROR environment variable.
+    columns : list
+        An optional list of the attribute columns to keep; the geometry column is 
+        always returned. If None (the default), all columns are returned.
 
     Returns
     ----------
     geopandas.GeoDataFrame: A GeoDataFrame of US Census divisions.
     """
 
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
-    
-    if resolution not in ["500k", "5m", "20m"]:
+    year = _resolve_year("divisions", year)
+
+    if resolution not in _VALID_RES:
         raise ValueError("Invalid value for resolution. Valid values are '500k', '5m', and '20m'.")
 
-    url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_division_{resolution}.zip"
+    url = _build_tiger_url("division", year, cb = True, resolution = resolution)
 
-    div = _load_tiger(url, cache = cache)
+    div = _load_tiger(url, cache = cache, format = format, columns = columns)
 
     return div
\ No newline at end of file
@@ -1,4 +1,16 @@
-from pygris.helpers import _load_tiger
+from pygris.helpers import _resolve_year, _load_tiger
+from pygris._urls import _build_tiger_url
+
+
+def _load_native(fn, kind, cb, year, cache, subset_by):
+    # Shared body of the functions below, which differ only in the
+    # layer they download
+    year = _resolve_year(fn, year)
+
+    url = _build_tiger_url(kind, year, cb = cb)
+
+    return _load_tiger(url, cache = cache, subset_by = subset_by)
+
 
 def native_areas(cb = False, year = None, cache = False, subset_by = None):
     """
@@ -44,16 +56,7 @@ def native_areas(cb = False, year = None, cache = False, subset_by = None):
 
 
     """
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
-    
-    if cb:
-        url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_aiannh_500k.zip"
-    else:
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/AIANNH/tl_{year}_us_aiannh.zip"
-    
-    return _load_tiger(url, cache = cache, subset_by = subset_by)
+    return _load_native("native_areas", "aiannh", cb, year, cache, subset_by)
 
 
 def tribal_subdivisions_national(cb = False, year = None, cache = False, subset_by = None):
@@ -100,19 +103,7 @@ def tribal_subdivisions_national(cb = False, year = None, cache = False, subset_
 
 
     """
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
-    
-    if cb:
-        url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_aitsn_500k.zip"
-    else:
-        if year < 2015:            
-            url = f"https://www2.census.gov/geo/tiger/TIGER{year}/AITS/tl_{year}_us_aitsn.zip"
-        else:
-            url = f"https://www2.census.gov/geo/tiger/TIGER{year}/AITSN/tl_{year}_us_aitsn.zip"
-
-    return _load_tiger(url, cache = cache, subset_by = subset_by)
+    return _load_native("tribal_subdivisions_national", "aitsn", cb, year, cache, subset_by)
 
 
 def alaska_native_regional_corporations(cb = False, year = None, cache = False, subset_by = None):
@@ -159,16 +150,7 @@ def alaska_native_regional_corporations(cb = False, year = None, cache = False,
 
 
     """
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
-    
-    if cb:
-        url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_02_anrc_500k.zip"
-    else:
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/ANRC/tl_{year}_02_anrc.zip"
-    
-    return _load_tiger(url, cache = cache, subset_by = subset_by)
+    return _load_native("alaska_native_regional_corporations", "anrc", cb, year, cache, subset_by)
 
 
 def tribal_block_groups(cb = False, year = None, cache = False, subset_by = None):
@@ -215,16 +197,7 @@ def tribal_block_groups(cb = False, year = None, cache = False, subset_by = None
 
 
     """
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
-    
-    if cb:
-        url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_tbg_500k.zip"
-    else:
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/TBG/tl_{year}_us_tbg.zip"
-    
-    return _load_tiger(url, cache = cache, subset_by = subset_by)
+    return _load_native("tribal_block_groups", "tbg", cb, year, cache, subset_by)
 
 
 
@@ -272,13 +245,4 @@ def tribal_tracts(cb = False, year = None, cache = False, subset_by = None):
 
 
     """
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
-    
-    if cb:
-        url = f"https://www2.census.gov/geo/tiger/GENZ{year}/shp/cb_{year}_us_ttract_500k.zip"
-    else:
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/TTRACT/tl_{year}_us_ttract.zip"
-    
-    return _load_tiger(url, cache = cache, subset_by = subset_by)
\ No newline at end of file
+    return _load_native("tribal_tracts", "ttract", cb, year, cache, subset_by)
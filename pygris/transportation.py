@@ -2,10 +2,10 @@
 
 __author__ = "Kyle Walker <kyle@walker-data.com"
 
-from .helpers import _load_tiger, validate_state, validate_county, fips_codes
-import pandas as pd
+from .helpers import _resolve_year, _load_tiger, _fetch_many, _fetch_many_async, _county_urls, _concat, validate_state
+from ._urls import _build_tiger_url
 
-def roads(state, county, year = None, cache = False, subset_by = None):
+def roads(state, county, year = None, cache = False, subset_by = None, max_workers = 8):
 
     """
     Load a roads shapefile into Python as a GeoDataFrame
@@ -14,8 +14,9 @@ def roads(state, county, year = None, cache = False, subset_by = None):
     ----------
     state : str 
         The state name, state abbreviation, or two-digit FIPS code of the desired state. 
-    county : str or list
-        The county name or three-digit FIPS code of the desired county, or a list of such counties. 
+    county : str or list-like
+        The county name or three-digit FIPS code of the desired county, or a list, tuple, 
+        numpy array, or pandas Series of such counties. 
     year : int 
         The year of the TIGER/Line or cartographic boundary shapefile. 
     cache : bool 
@@ -38,6 +39,9 @@ def roads(state, county, year = None, cache = False, subset_by = None):
             * A dict of format {"address": "buffer_distance"} will return rows
             that intersect a buffer of a given distance (in meters) around an 
             input address.  
+    max_workers : int
+        The number of county files to download at once when several counties 
+        are requested. Defaults to 8.
     
     Returns
     ----------
@@ -50,34 +54,78 @@ def roads(state, county, year = None, cache = False, subset_by = None):
     
     """
 
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
-    
-    state = validate_state(state)
+    urls = _county_urls("roads", "roads", state, county, year, subset_by = subset_by)
+
+    # Download the county files concurrently
+    county_roads = _fetch_many(urls, cache = cache, subset_by = subset_by, workers = max_workers)
 
-    if type(county) is list:
-        valid_county = [validate_county(state, x) for x in county]
+    if len(county_roads) == 1:
+        return county_roads[0]
 
-        county_roads = []     
-        
-        for i in valid_county:
-            url = f"https://www2.census.gov/geo/tiger/TIGER{year}/ROADS/tl_{year}_{state}{i}_roads.zip"
-            r = _load_tiger(url, cache = cache, subset_by = subset_by)
-            county_roads.append(r)
-        
-        all_r = pd.concat(county_roads, ignore_index = True)
+    return _concat(county_roads)
 
-        return all_r
 
+async def roads_async(state, county, year = None, cache = False, subset_by = None, max_connections = 16):
 
-    else:
-        valid_county = validate_county(state, county)
+    """
+    Asynchronously load a roads shapefile into Python as a GeoDataFrame
+
+    Parameters
+    ----------
+    state : str 
+        The state name, state abbreviation, or two-digit FIPS code of the desired state. 
+    county : str or list-like
+        The county name or three-digit FIPS code of the desired county, or a list, tuple, 
+        numpy array, or pandas Series of such counties. 
+    year : int 
+        The year of the TIGER/Line or cartographic boundary shapefile. 
+    cache : bool 
+        If True, the function will download a Census shapefile to a cache directory 
+        on the user's computer for future access.  If False, the function will load
+        the shapefile directly from the Census website.      
+    subset_by : tuple, int, slice, dict, geopandas.GeoDataFrame, or geopandas.GeoSeries
+        An optional directive telling pygris to return a subset of data using 
+        underlying arguments in geopandas.read_file().  
+        subset_by operates as follows:
+            * If a user supplies a tuple of format (minx, miny, maxx, maxy), 
+            it will be interpreted as a bounding box and rows will be returned
+            that intersect that bounding box;
+            * If a user supplies a integer or a slice object, the first n rows
+            (or the rows defined by the slice object) will be returned;
+            * If a user supplies an object of type geopandas.GeoDataFrame
+            or of type geopandas.GeoSeries, rows that intersect the input 
+            object will be returned. CRS misalignment will be resolved 
+            internally.  
+            * A dict of format {"address": "buffer_distance"} will return rows
+            that intersect a buffer of a given distance (in meters) around an 
+            input address.  
+    max_connections : int
+        The largest number of county files downloaded at once. Defaults to 16.
+    
+    Returns
+    ----------
+    geopandas.GeoDataFrame: A GeoDataFrame of roads.
+
+
+    Notes
+    ----------
+    A coroutine counterpart to roads() for use with `await` (or asyncio.run()). 
+    With httpx installed, all county files are downloaded over a single HTTP/2 
+    connection, and each file is parsed on a worker thread.
+
+    See https://www2.census.gov/geo/pdfs/maps-data/data/tiger/tgrshp2020/TGRSHP2020_TechDoc.pdf for more information.
     
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/ROADS/tl_{year}_{state}{valid_county}_roads.zip"
-        r = _load_tiger(url, cache = cache, subset_by = subset_by)
+    """
+
+    urls = _county_urls("roads", "roads", state, county, year, subset_by = subset_by)
+
+    county_roads = await _fetch_many_async(urls, cache = cache, subset_by = subset_by,
+                                           max_connections = max_connections)
+
+    if len(county_roads) == 1:
+        return county_roads[0]
 
-        return r
+    return _concat(county_roads)
 
 
 def primary_roads(year = None, cache = False, subset_by = None):
@@ -121,11 +169,9 @@ def primary_roads(year = None, cache = False, subset_by = None):
     
     """
 
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
+    year = _resolve_year("primary_roads", year)
     
-    url = f"https://www2.census.gov/geo/tiger/TIGER{year}/PRIMARYROADS/tl_{year}_us_primaryroads.zip"
+    url = _build_tiger_url("primaryroads", year)
     r = _load_tiger(url, cache = cache, subset_by = subset_by)
 
     return r
@@ -174,13 +220,11 @@ def primary_secondary_roads(state, year = None, cache = False, subset_by = None)
     
     """
 
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
+    year = _resolve_year("primary_secondary_roads", year)
     
     state = validate_state(state)
     
-    url = f"https://www2.census.gov/geo/tiger/TIGER{year}/PRISECROADS/tl_{year}_{state}_prisecroads.zip"
+    url = _build_tiger_url("prisecroads", year, state = state)
 
     r = _load_tiger(url, cache = cache, subset_by = subset_by)
 
@@ -228,17 +272,15 @@ def rails(year = None, cache = False, subset_by = None):
     
     """
 
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
+    year = _resolve_year("rails", year)
     
-    url = f"https://www2.census.gov/geo/tiger/TIGER{year}/RAILS/tl_{year}_us_rails.zip"
+    url = _build_tiger_url("rails", year)
     r = _load_tiger(url, cache = cache, subset_by = subset_by)
 
     return r
 
 
-def address_ranges(state, county, year = None, cache = False, subset_by = None):
+def address_ranges(state, county, year = None, cache = False, subset_by = None, max_workers = 8):
 
     """
     Load an address ranges shapefile into Python as a GeoDataFrame
@@ -247,8 +289,9 @@ def address_ranges(state, county, year = None, cache = False, subset_by = None):
     ----------
     state : str 
         The state name, state abbreviation, or two-digit FIPS code of the desired state. 
-    county : str or list
-        The county name or three-digit FIPS code of the desired county, or a list of such counties. 
+    county : str or list-like
+        The county name or three-digit FIPS code of the desired county, or a list, tuple, 
+        numpy array, or pandas Series of such counties. 
     year : int 
         The year of the TIGER/Line or cartographic boundary shapefile. 
     cache : bool 
@@ -271,6 +314,9 @@ def address_ranges(state, county, year = None, cache = False, subset_by = None):
             * A dict of format {"address": "buffer_distance"} will return rows
             that intersect a buffer of a given distance (in meters) around an 
             input address.  
+    max_workers : int
+        The number of county files to download at once when several counties 
+        are requested. Defaults to 8.
     
     Returns
     ----------
@@ -283,31 +329,75 @@ def address_ranges(state, county, year = None, cache = False, subset_by = None):
     
     """
 
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
-    
-    state = validate_state(state)
+    urls = _county_urls("address_ranges", "addrfeat", state, county, year, subset_by = subset_by)
+
+    # Download the county files concurrently
+    county_ranges = _fetch_many(urls, cache = cache, subset_by = subset_by, workers = max_workers)
 
-    if type(county) is list:
-        valid_county = [validate_county(state, x) for x in county]
+    if len(county_ranges) == 1:
+        return county_ranges[0]
 
-        county_ranges = []     
-        
-        for i in valid_county:
-            url = f"https://www2.census.gov/geo/tiger/TIGER{year}/ADDRFEAT/tl_{year}_{state}{i}_addrfeat.zip"
-            r = _load_tiger(url, cache = cache, subset_by = subset_by)
-            county_ranges.append(r)
-        
-        all_r = pd.concat(county_ranges, ignore_index = True)
+    return _concat(county_ranges)
 
-        return all_r
 
+async def address_ranges_async(state, county, year = None, cache = False, subset_by = None, max_connections = 16):
 
-    else:
-        valid_county = validate_county(state, county)
+    """
+    Asynchronously load an address ranges shapefile into Python as a GeoDataFrame
+
+    Parameters
+    ----------
+    state : str 
+        The state name, state abbreviation, or two-digit FIPS code of the desired state. 
+    county : str or list-like
+        The county name or three-digit FIPS code of the desired county, or a list, tuple, 
+        numpy array, or pandas Series of such counties. 
+    year : int 
+        The year of the TIGER/Line or cartographic boundary shapefile. 
+    cache : bool 
+        If True, the function will download a Census shapefile to a cache directory 
+        on the user's computer for future access.  If False, the function will load
+        the shapefile directly from the Census website.      
+    subset_by : tuple, int, slice, dict, geopandas.GeoDataFrame, or geopandas.GeoSeries
+        An optional directive telling pygris to return a subset of data using 
+        underlying arguments in geopandas.read_file().  
+        subset_by operates as follows:
+            * If a user supplies a tuple of format (minx, miny, maxx, maxy), 
+            it will be interpreted as a bounding box and rows will be returned
+            that intersect that bounding box;
+            * If a user supplies a integer or a slice object, the first n rows
+            (or the rows defined by the slice object) will be returned;
+            * If a user supplies an object of type geopandas.GeoDataFrame
+            or of type geopandas.GeoSeries, rows that intersect the input 
+            object will be returned. CRS misalignment will be resolved 
+            internally.  
+            * A dict of format {"address": "buffer_distance"} will return rows
+            that intersect a buffer of a given distance (in meters) around an 
+            input address.  
+    max_connections : int
+        The largest number of county files downloaded at once. Defaults to 16.
+    
+    Returns
+    ----------
+    geopandas.GeoDataFrame: A GeoDataFrame of address ranges.
+
+
+    Notes
+    ----------
+    A coroutine counterpart to address_ranges() for use with `await` (or asyncio.run()). 
+    With httpx installed, all county files are downloaded over a single HTTP/2 
+    connection, and each file is parsed on a worker thread.
+
+    See https://www2.census.gov/geo/pdfs/maps-data/data/tiger/tgrshp2020/TGRSHP2020_TechDoc.pdf for more information.
     
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/ADDRFEAT/tl_{year}_{state}{valid_county}_addrfeat.zip"
-        r = _load_tiger(url, cache = cache, subset_by = subset_by)
+    """
+
+    urls = _county_urls("address_ranges", "addrfeat", state, county, year, subset_by = subset_by)
+
+    county_ranges = await _fetch_many_async(urls, cache = cache, subset_by = subset_by,
+                                            max_connections = max_connections)
+
+    if len(county_ranges) == 1:
+        return county_ranges[0]
 
-        return r
\ No newline at end of file
+    return _concat(county_ranges)
@@ -4,9 +4,138 @@ __author__ = "Kyle Walker <kyle@walker-data.com>"
 
 from pygris.enumeration_units import counties, states
 from pygris.water import area_water
-import warnings
+from pygris.helpers import _DEFAULT_YEAR, _resolve_year, _filter_intersecting
+from shapely.ops import unary_union
+from shapely.geometry import box as box_geometry
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 import geopandas as gp
+
+# The reference layers below are read once per session and then shared
+# between calls; they are only ever read from, never modified in place
+
+@functools.lru_cache(maxsize = 8)
+def _us_counties(year):
+    # Cartographic boundary counties used to find the counties an input covers
+    return counties(cb = True, resolution = "500k", year = year)
+
+
+@functools.lru_cache(maxsize = 8)
+def _minimal_states(year):
+    # Generalized state outlines used to place Alaska, Hawaii and Puerto Rico
+    return states(cb = True, resolution = "20m", year = year)
+
+
+# Projected CRS that Alaska, Hawaii and Puerto Rico are each rescaled in
+_SHIFT_CRS = {"02": 3338, "15": "ESRI:102007", "72": 32161}
+
+
+@functools.lru_cache(maxsize = 1)
+def _shift_reference():
+    # Everything shift_geometry() needs that does not depend on its input:
+    # the Albers CRS, the boxes around Alaska, Hawaii and Puerto Rico, the
+    # centroid of each of the three in its own CRS, and the bounds of the
+    # lower 48
+    minimal_states = _minimal_states(_DEFAULT_YEAR).to_crs('ESRI:102003')
+
+    state_geoids = minimal_states['GEOID'].to_numpy()
+
+    boxes = {}
+    centroids = {}
+
+    for fips, crs in _SHIFT_CRS.items():
+        state = minimal_states[state_geoids == fips]
+        boxes[fips] = gp.GeoDataFrame(geometry = state.envelope)
+        centroids[fips] = state.to_crs(crs).centroid
+
+    bb = minimal_states[~np.isin(state_geoids, list(_SHIFT_CRS))].total_bounds
+
+    return minimal_states.crs, boxes, centroids, bb
+
+
+def _intersects_box(geometry, bounds, box):
+    # Boolean mask of the geometries that intersect an axis-aligned box,
+    # given their bounds as an (n, 4) array. A geometry whose bounds miss
+    # the box can't intersect it, and one whose bounds lie inside the box
+    # must, so only those straddling its edges need an intersects() test.
+    minx, miny, maxx, maxy = box
+
+    overlaps = ((bounds[:, 0] <= maxx) & (bounds[:, 2] >= minx) &
+                (bounds[:, 1] <= maxy) & (bounds[:, 3] >= miny))
+
+    inside = ((bounds[:, 0] >= minx) & (bounds[:, 2] <= maxx) &
+              (bounds[:, 1] >= miny) & (bounds[:, 3] <= maxy))
+
+    result = inside.copy()
+
+    straddling = overlaps & ~inside
+
+    if straddling.any():
+        result[straddling] = geometry[straddling].intersects(box_geometry(*box)).to_numpy()
+
+    return result
+
+
+def _clip_to_box(gdf, box):
+    # Clip gdf to the rectangle in the GeoDataFrame box, dropping the
+    # features that fall outside it. The dedicated rectangle clip is used
+    # where geopandas has it (0.12 and later) rather than a full overlay.
+    if not hasattr(gdf.geometry, "clip_by_rect"):
+        return gdf.overlay(box)
+
+    clipped = gdf.copy()
+    clipped[gdf.geometry.name] = gdf.geometry.clip_by_rect(*box.total_bounds)
+
+    return clipped[~clipped.is_empty]
+
+
+# Where shift_geometry() places Alaska, Hawaii and Puerto Rico, keyed by
+# (preserve_area, position, state FIPS). Each entry is the x and y position
+# as fractions of the width and height of the lower 48's bounding box,
+# followed by the scale factor.
+_SHIFT_PARAMS = {
+    (False, "below", "02"): (0.06, -0.14, 0.5),
+    (False, "below", "15"): (0.32, 0.2, 1.5),
+    (False, "below", "72"): (0.75, 0.15, 2.5),
+    (False, "outside", "02"): (-0.08, 0.92, 0.5),
+    (False, "outside", "15"): (0.05, 0.35, 1.5),
+    (False, "outside", "72"): (1.0, 0.05, 2.5),
+    (True, "below", "02"): (0.2, -0.13, 1),
+    (True, "below", "15"): (0.6, -0.1, 1),
+    (True, "below", "72"): (0.75, -0.1, 1),
+    (True, "outside", "02"): (-0.25, 1.35, 1),
+    (True, "outside", "15"): (0.0, 0.2, 1),
+    (True, "outside", "72"): (0.95, -0.05, 1)
+}
+
+
+def _at_or_above_rank(values, threshold):
+    # Boolean mask of the values whose percentile rank (as computed by
+    # Series.rank(pct = True), with ties sharing their average rank) is at
+    # least threshold. Only the cutoff value is needed, so it is found with
+    # a linear-time partition instead of ranking everything.
+    n = values.size
+
+    if n == 0:
+        return np.zeros(0, dtype = bool)
+
+    # The k-th smallest value (0-based) has rank k + 1 when it is untied
+    k = min(max(int(np.ceil(threshold * n)) - 1, 0), n - 1)
+    cutoff = np.partition(values, k)[k]
+
+    # Values tied with the cutoff share one average rank, which decides
+    # whether they are kept as a group
+    n_below = np.count_nonzero(values < cutoff)
+    n_tied = np.count_nonzero(values == cutoff)
+
+    if (n_below + (n_tied + 1) / 2) / n >= threshold:
+        return values >= cutoff
+
+    return values > cutoff
+
+
 def erase_water(input, area_threshold = 0.75, year = None, cache = False):
     """
     Automate the process of removing water area from an input dataset
@@ -48,44 +177,75 @@ def erase_water(input, area_threshold = 0.75, year = None, cache = False):
     misalignment are always possible; it is recommended to inspect your data after running 
     this function.  
     """
-    if year is None:
-        year = 2021
+    year = _resolve_year("erase_water", year)
 
     # Get a dataset of US counties
-    us_counties = counties(cb = True, resolution = "500k", year = year)
+    us_counties = _us_counties(year)
 
-    # Find the county GEOIDs that overlap the input object
-    with warnings.catch_warnings():
-        county_proj = us_counties.to_crs(input.crs)
-        county_proj['county_id'] = county_proj['GEOID']
-        county_overlaps = county_proj.overlay(input, keep_geom_type = False)
+    # Find the county GEOIDs that overlap the input object with a single
+    # spatial index query, rather than intersecting every county with it
+    county_proj = us_counties.to_crs(input.crs)
 
-    county_ids = county_overlaps['county_id'].unique().tolist()
+    county_ids = _filter_intersecting(county_proj, input)['GEOID'].tolist()
 
     if len(county_ids) == 0:
         raise ValueError("Your dataset does not appear to be in the United States; this function is not appropriate for your data.")
 
-    water_list = []
+    # Fetch the water for each county concurrently; the downloads and file
+    # reads release the GIL, so threads are enough to overlap them
+    def fetch_water(geoid):
+        return area_water(state = geoid[0:2], county = geoid[2:], year = year, cache = cache)
+
+    with ThreadPoolExecutor(max_workers = min(16, len(county_ids))) as executor:
+        water_list = list(executor.map(fetch_water, county_ids))
+
+    # Only the water areas and geometries are needed, so those two columns
+    # are stacked as plain arrays rather than concatenating whole frames.
+    # The threshold only looks at AWATER, so the smaller water areas are
+    # dropped before the rest are reprojected (in one go, as the county
+    # files share a CRS).
+    awater = np.concatenate([w['AWATER'].to_numpy() for w in water_list])
+
+    all_water = gp.GeoSeries(np.concatenate([w.geometry.to_numpy() for w in water_list]),
+                             crs = water_list[0].crs)
+
+    water_thresh = all_water[_at_or_above_rank(awater, area_threshold)].to_crs(input.crs)
+
+    # Erase the water area. Each input feature is differenced against the
+    # union of just the water polygons that intersect it, looked up with a
+    # single bulk query of the water's spatial index; features that touch
+    # no water are left as they are. As with overlay(), features left
+    # empty are dropped.
+    water_thresh = water_thresh.reset_index(drop = True)
+
+    sindex = water_thresh.sindex
 
-    for i in county_ids:
-        state = i[0:2]
-        county = i[2:]
+    if hasattr(sindex, "query_bulk"):
+        input_idx, water_idx = sindex.query_bulk(input.geometry.values, predicate = "intersects")
+    else:
+        input_idx, water_idx = sindex.query(input.geometry.values, predicate = "intersects")
+
+    order = np.argsort(input_idx, kind = "stable")
+    input_idx = input_idx[order]
+    water_idx = water_idx[order]
 
-        water = area_water(state = state, county = county, year = year, cache = cache)
+    hits, starts = np.unique(input_idx, return_index = True)
 
-        water_proj = water.to_crs(input.crs)
+    erased = input.copy()
+    geometry = erased.geometry.name
 
-        water_list.append(water_proj)
+    geoms = erased.geometry.to_numpy()
 
-    all_water = pd.concat(water_list, ignore_index = True)
+    if len(hits) > 0:
+        water_geoms = water_thresh.to_numpy()
 
-    all_water['water_rank'] = all_water.AWATER.rank(pct = True)
+        local_water = [unary_union(water_geoms[w]) for w in np.split(water_idx, starts[1:])]
 
-    water_thresh = all_water.query('water_rank >= @area_threshold')
+        geoms[hits] = gp.GeoSeries(geoms[hits]).difference(gp.GeoSeries(local_water)).to_numpy()
 
-    # Erase the water area
+    erased[geometry] = gp.GeoSeries(geoms, index = erased.index, crs = input.crs)
 
-    erased = input.overlay(water_thresh, how = "difference")
+    erased = erased[~erased.is_empty].reset_index(drop = True)
 
     return erased
 
@@ -139,184 +299,80 @@ def shift_geometry(input, geoid_column = None, preserve_area = False, position =
     
     """
 
-    minimal_states = states(cb = True, resolution = "20m", year = 2021).to_crs('ESRI:102003')
-
-    ak_bbox = gp.GeoDataFrame(geometry = minimal_states.query("GEOID == '02'").envelope)
-    hi_bbox = gp.GeoDataFrame(geometry = minimal_states.query("GEOID == '15'").envelope)
-    pr_bbox = gp.GeoDataFrame(geometry = minimal_states.query("GEOID == '72'").envelope)
-
-    boxes = pd.concat([ak_bbox, hi_bbox, pr_bbox])
+    if position not in ("below", "outside"):
+        raise ValueError("position must be one of 'below' or 'outside'.")
 
-    boxes['state_fips'] = ['02', '15', '72']
+    albers_crs, boxes, centroids, bb = _shift_reference()
 
-    input_albers = input.to_crs(minimal_states.crs)
+    input_albers = input.to_crs(albers_crs)
 
+    # Each feature gets a small integer code rather than a string column:
+    # 0 for the lower 48 (or anything else), then 1, 2 and 3 for Alaska,
+    # Hawaii and Puerto Rico
     if geoid_column is not None:
-        input_albers['state_fips'] = input_albers[geoid_column].str.slice(0, 2)
+        state_fips = input_albers[geoid_column].str.slice(0, 2)
+        area_codes = np.select([(state_fips == fips).to_numpy() for fips in ('02', '15', '72')],
+                               [1, 2, 3], default = 0).astype(np.int8)
     else:
-        input_albers = input_albers.sjoin(boxes, how = "left")
+        # Test every feature against each of the three boxes. Building a
+        # spatial index for a join against three rows costs more than it
+        # saves, so the feature bounds are compared with the boxes instead
+        bounds = input_albers.bounds.to_numpy()
 
-        input_albers['state_fips'] = input_albers['state_fips'].fillna("00")
-    
-    # Alaska/Hawaii/PR centroids are necessary to put any dataset in the correct location
-    ak_crs = 3338
-    hi_crs = 'ESRI:102007'
-    pr_crs = 32161
+        in_box = [_intersects_box(input_albers.geometry, bounds, boxes[fips].total_bounds)
+                  for fips in ('02', '15', '72')]
 
-    ak_centroid = minimal_states.query("GEOID == '02'").to_crs(ak_crs).centroid
-    hi_centroid = minimal_states.query("GEOID == '15'").to_crs(hi_crs).centroid
-    pr_centroid = minimal_states.query("GEOID == '72'").to_crs(pr_crs).centroid
+        area_codes = np.select(in_box, [1, 2, 3], default = 0).astype(np.int8)
 
     def place_geometry_wilke(geometry, position, centroid, scale = 1):
+        # Shift the geometry by the negative centroid, scale it about the
+        # centroid, then move it to position. The three steps combine into
+        # a single affine transformation, applied in one pass over the
+        # coordinates. The result is in Albers coordinates, so it is
+        # labelled with that CRS directly.
         centroid_x = centroid.x.values[0]
         centroid_y = centroid.y.values[0]
-        diff = geometry.translate(xoff = -centroid_x, yoff = -centroid_y)
-        scaled = diff.scale(xfact = scale, yfact = scale, origin = (centroid_x, centroid_y))
-        return scaled.translate(xoff = position[0], yoff = position[1])
-
-    bb = minimal_states.query('GEOID not in ["02", "15", "72"]', engine = "python").total_bounds
+        xoff = position[0] + centroid_x - 2 * scale * centroid_x
+        yoff = position[1] + centroid_y - 2 * scale * centroid_y
+        placed = geometry.affine_transform([scale, 0, 0, scale, xoff, yoff])
+        return gp.GeoSeries(placed.to_numpy(), index = placed.index, crs = albers_crs)
 
-    us_lower48 = input_albers.query('state_fips not in ["02", "15", "72"]', engine = "python")
+    us_lower48 = input_albers[area_codes <= 0]
 
-    us_alaska = input_albers.query('state_fips == "02"')
-    us_hawaii = input_albers.query('state_fips == "15"')
-    us_puerto_rico = input_albers.query('state_fips == "72"')
+    us_alaska = input_albers[area_codes == 1]
+    us_hawaii = input_albers[area_codes == 2]
+    us_puerto_rico = input_albers[area_codes == 3]
 
-    if pd.concat([us_alaska, us_hawaii, us_puerto_rico]).shape[0] == 0:
+    if us_alaska.shape[0] + us_hawaii.shape[0] + us_puerto_rico.shape[0] == 0:
         UserWarning("None of your features are in Alaska, Hawaii, or Puerto Rico, so no geometries will be shifted.\nTransforming your object's CRS to 'ESRI:102003'")
-        return input_albers.drop(['state_fips', 'index_right'], axis = 1)
+        return input_albers
     
+    # Each area is moved from its own projected CRS, scaled about its
+    # centroid and placed relative to the bounding box of the lower 48
+    areas = [("02", us_alaska), ("15", us_hawaii), ("72", us_puerto_rico)]
+
     shapes_list = [us_lower48]
 
-    if not preserve_area:
-        if us_alaska.shape[0] > 0:
-            ak_rescaled = us_alaska.to_crs(ak_crs)
-
-            if position == "below":
-                ak_rescaled.geometry = place_geometry_wilke(
-                    geometry = ak_rescaled.geometry,
-                    position = [bb[0] + 0.06 * (bb[2] - bb[0]), bb[1] - 0.14 * (bb[3] - bb[1])],
-                    scale = 0.5,
-                    centroid = ak_centroid)
-
-            elif position == "outside":
-                ak_rescaled.geometry = place_geometry_wilke(
-                    geometry = ak_rescaled.geometry,
-                    position = [bb[0] - 0.08 * (bb[2] - bb[0]), bb[1] + 0.92 * (bb[3] - bb[1])],
-                    scale = 0.5,
-                    centroid = ak_centroid)
-            
-            ak_rescaled.set_crs('ESRI:102003', inplace = True, allow_override = True)
-
-            shapes_list.append(ak_rescaled)
-        
-        if us_hawaii.shape[0] > 0:
-            
-            hi_rescaled = us_hawaii.overlay(hi_bbox).to_crs(hi_crs)
-
-            if position == "below":
-                hi_rescaled.geometry = place_geometry_wilke(
-                    geometry = hi_rescaled.geometry,
-                    position = [bb[0] + 0.32 * (bb[2] - bb[0]), bb[1] + 0.2 * (bb[3] - bb[1])],
-                    scale = 1.5,
-                    centroid = hi_centroid)
-            elif position == "outside":
-                hi_rescaled.geometry = place_geometry_wilke(
-                    geometry = hi_rescaled.geometry,
-                    position = [bb[0] + 0.05 * (bb[2] - bb[0]), bb[1] + 0.35 * (bb[3] - bb[1])],
-                    scale = 1.5,
-                    centroid = hi_centroid)
-            
-            hi_rescaled.set_crs('ESRI:102003', inplace = True, allow_override = True)
-
-            shapes_list.append(hi_rescaled)
-
-        if us_puerto_rico.shape[0] > 0:
-            pr_rescaled = us_puerto_rico.to_crs(pr_crs)
-
-            if position == "below":
-                pr_rescaled.geometry = place_geometry_wilke(
-                    geometry = pr_rescaled.geometry,
-                    position = [bb[0] + 0.75 * (bb[2] - bb[0]), bb[1] + 0.15 * (bb[3] - bb[1])],
-                    scale = 2.5,
-                    centroid = pr_centroid)
-            elif position == "outside":
-                pr_rescaled.geometry = place_geometry_wilke(
-                    geometry = pr_rescaled.geometry,
-                    position = [bb[0] + 1.0 * (bb[2] - bb[0]), bb[1] + 0.05 * (bb[3] - bb[1])],
-                    scale = 2.5,
-                    centroid = pr_centroid)
-            
-            pr_rescaled.set_crs('ESRI:102003', inplace = True, allow_override = True)
-
-            shapes_list.append(pr_rescaled)
-        
-        output_data = pd.concat(shapes_list).drop(['state_fips', 'index_right'], axis = 1)
-
-        return output_data
+    for fips, area in areas:
+        if area.shape[0] == 0:
+            continue
 
-    else:
-        if us_alaska.shape[0] > 0:
-            ak_rescaled = us_alaska.to_crs(ak_crs)
-
-            if position == "below":
-                ak_rescaled.geometry = place_geometry_wilke(
-                    geometry = ak_rescaled.geometry,
-                    position = [bb[0] + 0.2 * (bb[2] - bb[0]), bb[1] - 0.13 * (bb[3] - bb[1])],
-                    scale = 1,
-                    centroid = ak_centroid)
-
-            elif position == "outside":
-                ak_rescaled.geometry = place_geometry_wilke(
-                    geometry = ak_rescaled.geometry,
-                    position = [bb[0] - 0.25 * (bb[2] - bb[0]), bb[1] + 1.35 * (bb[3] - bb[1])],
-                    scale = 1,
-                    centroid = ak_centroid)
-            
-            ak_rescaled.set_crs('ESRI:102003', inplace = True, allow_override = True)
-
-            shapes_list.append(ak_rescaled)
-        
-        if us_hawaii.shape[0] > 0:
-            hi_rescaled = us_hawaii.overlay(hi_bbox).to_crs(hi_crs)
-
-            if position == "below":
-                hi_rescaled.geometry = place_geometry_wilke(
-                    geometry = hi_rescaled.geometry,
-                    position = [bb[0] + 0.6 * (bb[2] - bb[0]), bb[1] - 0.1 * (bb[3] - bb[1])],
-                    scale = 1,
-                    centroid = hi_centroid)
-            elif position == "outside":
-                hi_rescaled.geometry = place_geometry_wilke(
-                    geometry = hi_rescaled.geometry,
-                    position = [bb[0] - 0.0 * (bb[2] - bb[0]), bb[1] + 0.2 * (bb[3] - bb[1])],
-                    scale = 1,
-                    centroid = hi_centroid)
-            
-            hi_rescaled.set_crs('ESRI:102003', inplace = True, allow_override = True)
-
-            shapes_list.append(hi_rescaled)
-
-        if us_puerto_rico.shape[0] > 0:
-            pr_rescaled = us_puerto_rico.to_crs(pr_crs)
-
-            if position == "below":
-                pr_rescaled.geometry = place_geometry_wilke(
-                    geometry = pr_rescaled.geometry,
-                    position = [bb[0] + 0.75 * (bb[2] - bb[0]), bb[1] - 0.1 * (bb[3] - bb[1])],
-                    scale = 1,
-                    centroid = pr_centroid)
-            elif position == "outside":
-                pr_rescaled.geometry = place_geometry_wilke(
-                    geometry = pr_rescaled.geometry,
-                    position = [bb[0] + 0.95 * (bb[2] - bb[0]), bb[1] - 0.05 * (bb[3] - bb[1])],
-                    scale = 1,
-                    centroid = pr_centroid)
-            
-            pr_rescaled.set_crs('ESRI:102003', inplace = True, allow_override = True)
-
-            shapes_list.append(pr_rescaled)
-        
-        output_data = pd.concat(shapes_list).drop(['state_fips', 'index_right'], axis = 1)
-
-        return output_data
+        # Hawaii is clipped to its box to leave out the far-flung islands
+        if fips == "15":
+            area = _clip_to_box(area, boxes["15"])
+
+        rescaled = area.to_crs(_SHIFT_CRS[fips])
+
+        x_frac, y_frac, scale = _SHIFT_PARAMS[(bool(preserve_area), position, fips)]
+
+        rescaled.geometry = place_geometry_wilke(
+            geometry = rescaled.geometry,
+            position = [bb[0] + x_frac * (bb[2] - bb[0]), bb[1] + y_frac * (bb[3] - bb[1])],
+            scale = scale,
+            centroid = centroids[fips])
+
+        shapes_list.append(rescaled)
+
+    output_data = pd.concat(shapes_list)
+
+    return output_data
@@ -2,9 +2,9 @@
 
 __author__ = "Kyle Walker <kyle@walker-data.com"
 
-from .helpers import _load_tiger, validate_state, validate_county, fips_codes
-import pandas as pd
-def area_water(state, county, year = None, cache = False, subset_by = None):
+from .helpers import _resolve_year, _load_tiger, _fetch_many, _fetch_many_async, _county_urls, _concat
+
+def area_water(state, county, year = None, cache = False, subset_by = None, max_workers = 8):
     """
     Load an area water shapefile into Python as a GeoDataFrame
 
@@ -12,8 +12,9 @@ def area_water(state, county, year = None, cache = False, subset_by = None):
     ----------
     state : str 
         The state name, state abbreviation, or two-digit FIPS code of the desired state. 
-    county : str or list
-        The county name or three-digit FIPS code of the desired county, or a list of such counties. 
+    county : str or list-like
+        The county name or three-digit FIPS code of the desired county, or a list, tuple, 
+        numpy array, or pandas Series of such counties. 
     year : int 
         The year of the TIGER/Line or cartographic boundary shapefile. 
     cache : bool 
@@ -36,6 +37,9 @@ def area_water(state, county, year = None, cache = False, subset_by = None):
             * A dict of format {"address": "buffer_distance"} will return rows
             that intersect a buffer of a given distance (in meters) around an 
             input address.  
+    max_workers : int
+        The number of county files to download at once when several counties 
+        are requested. Defaults to 8.
     
     Returns
     ----------
@@ -48,38 +52,81 @@ def area_water(state, county, year = None, cache = False, subset_by = None):
     
     """
 
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
+    urls = _county_urls("area_water", "areawater", state, county, year, subset_by = subset_by)
 
-    state = validate_state(state)
+    # Download the county files concurrently
+    county_water = _fetch_many(urls, cache = cache, subset_by = subset_by, workers = max_workers)
 
-    if type(county) is list:
-        valid_county = [validate_county(state, x) for x in county]
+    if len(county_water) == 1:
+        return county_water[0]
 
-        county_water = []     
-        
-        for i in valid_county:
-            url = f"https://www2.census.gov/geo/tiger/TIGER{year}/AREAWATER/tl_{year}_{state}{i}_areawater.zip"
-            w = _load_tiger(url, cache = cache, subset_by = subset_by)
-            county_water.append(w)
-        
-        all_w = pd.concat(county_water, ignore_index = True)
+    return _concat(county_water)
 
-        return all_w
 
+async def area_water_async(state, county, year = None, cache = False, subset_by = None, max_connections = 16):
+    """
+    Asynchronously load an area water shapefile into Python as a GeoDataFrame
 
-    else:
-        valid_county = validate_county(state, county)
+    Parameters
+    ----------
+    state : str 
+        The state name, state abbreviation, or two-digit FIPS code of the desired state. 
+    county : str or list-like
+        The county name or three-digit FIPS code of the desired county, or a list, tuple, 
+        numpy array, or pandas Series of such counties. 
+    year : int 
+        The year of the TIGER/Line or cartographic boundary shapefile. 
+    cache : bool 
+        If True, the function will download a Census shapefile to a cache directory 
+        on the user's computer for future access.  If False, the function will load
+        the shapefile directly from the Census website.      
+    subset_by : tuple, int, slice, dict, geopandas.GeoDataFrame, or geopandas.GeoSeries
+        An optional directive telling pygris to return a subset of data using 
+        underlying arguments in geopandas.read_file().  
+        subset_by operates as follows:
+            * If a user supplies a tuple of format (minx, miny, maxx, maxy), 
+            it will be interpreted as a bounding box and rows will be returned
+            that intersect that bounding box;
+            * If a user supplies a integer or a slice object, the first n rows
+            (or the rows defined by the slice object) will be returned;
+            * If a user supplies an object of type geopandas.GeoDataFrame
+            or of type geopandas.GeoSeries, rows that intersect the input 
+            object will be returned. CRS misalignment will be resolved 
+            internally.  
+            * A dict of format {"address": "buffer_distance"} will return rows
+            that intersect a buffer of a given distance (in meters) around an 
+            input address.  
+    max_connections : int
+        The largest number of county files downloaded at once. Defaults to 16.
+    
+    Returns
+    ----------
+    geopandas.GeoDataFrame: A GeoDataFrame of water areas.
+
+
+    Notes
+    ----------
+    A coroutine counterpart to area_water() for use with `await` (or asyncio.run()). 
+    With httpx installed, all county files are downloaded over a single HTTP/2 
+    connection, and each file is parsed on a worker thread.
+
+    See https://www2.census.gov/geo/pdfs/maps-data/data/tiger/tgrshp2020/TGRSHP2020_TechDoc.pdf for more information.
     
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/AREAWATER/tl_{year}_{state}{valid_county}_areawater.zip"
-        w = _load_tiger(url, cache = cache, subset_by = subset_by)
+    """
+
+    urls = _county_urls("area_water", "areawater", state, county, year, subset_by = subset_by)
+
+    county_water = await _fetch_many_async(urls, cache = cache, subset_by = subset_by,
+                                           max_connections = max_connections)
+
+    if len(county_water) == 1:
+        return county_water[0]
 
-        return w
+    return _concat(county_water)
 
     
 
-def linear_water(state, county, year = None, cache = False, subset_by = None):
+def linear_water(state, county, year = None, cache = False, subset_by = None, max_workers = 8):
     """
     Load a linear water shapefile into Python as a GeoDataFrame
 
@@ -87,8 +134,9 @@ def linear_water(state, county, year = None, cache = False, subset_by = None):
     ----------
     state : str 
         The state name, state abbreviation, or two-digit FIPS code of the desired state. 
-    county : str or list
-        The county name or three-digit FIPS code of the desired county, or a list of such counties. 
+    county : str or list-like
+        The county name or three-digit FIPS code of the desired county, or a list, tuple, 
+        numpy array, or pandas Series of such counties. 
     year : int 
         The year of the TIGER/Line or cartographic boundary shapefile. 
     cache : bool 
@@ -111,6 +159,9 @@ def linear_water(state, county, year = None, cache = False, subset_by = None):
             * A dict of format {"address": "buffer_distance"} will return rows
             that intersect a buffer of a given distance (in meters) around an 
             input address.  
+    max_workers : int
+        The number of county files to download at once when several counties 
+        are requested. Defaults to 8.
     
     Returns
     ----------
@@ -124,34 +175,78 @@ def linear_water(state, county, year = None, cache = False, subset_by = None):
     """
 
 
-    if year is None:
-        print("Using the default year of 2021")
-        year = 2021
+    urls = _county_urls("linear_water", "linearwater", state, county, year, subset_by = subset_by)
 
-    state = validate_state(state)
+    # Download the county files concurrently
+    county_water = _fetch_many(urls, cache = cache, subset_by = subset_by, workers = max_workers)
 
-    if type(county) is list:
-        valid_county = [validate_county(state, x) for x in county]
+    if len(county_water) == 1:
+        return county_water[0]
 
-        county_water = []     
-        
-        for i in valid_county:
-            url = f"https://www2.census.gov/geo/tiger/TIGER{year}/LINEARWATER/tl_{year}_{state}{i}_linearwater.zip"
-            w = _load_tiger(url, cache = cache, subset_by = subset_by)
-            county_water.append(w)
-        
-        all_w = pd.concat(county_water, ignore_index = True)
+    return _concat(county_water)
 
-        return all_w
 
+async def linear_water_async(state, county, year = None, cache = False, subset_by = None, max_connections = 16):
+    """
+    Asynchronously load a linear water shapefile into Python as a GeoDataFrame
 
-    else:
-        valid_county = validate_county(state, county)
+    Parameters
+    ----------
+    state : str 
+        The state name, state abbreviation, or two-digit FIPS code of the desired state. 
+    county : str or list-like
+        The county name or three-digit FIPS code of the desired county, or a list, tuple, 
+        numpy array, or pandas Series of such counties. 
+    year : int 
+        The year of the TIGER/Line or cartographic boundary shapefile. 
+    cache : bool 
+        If True, the function will download a Census shapefile to a cache directory 
+        on the user's computer for future access.  If False, the function will load
+        the shapefile directly from the Census website.      
+    subset_by : tuple, int, slice, dict, geopandas.GeoDataFrame, or geopandas.GeoSeries
+        An optional directive telling pygris to return a subset of data using 
+        underlying arguments in geopandas.read_file().  
+        subset_by operates as follows:
+            * If a user supplies a tuple of format (minx, miny, maxx, maxy), 
+            it will be interpreted as a bounding box and rows will be returned
+            that intersect that bounding box;
+            * If a user supplies a integer or a slice object, the first n rows
+            (or the rows defined by the slice object) will be returned;
+            * If a user supplies an object of type geopandas.GeoDataFrame
+            or of type geopandas.GeoSeries, rows that intersect the input 
+            object will be returned. CRS misalignment will be resolved 
+            internally.  
+            * A dict of format {"address": "buffer_distance"} will return rows
+            that intersect a buffer of a given distance (in meters) around an 
+            input address.  
+    max_connections : int
+        The largest number of county files downloaded at once. Defaults to 16.
+    
+    Returns
+    ----------
+    geopandas.GeoDataFrame: A GeoDataFrame of linear water.
+
+
+    Notes
+    ----------
+    A coroutine counterpart to linear_water() for use with `await` (or asyncio.run()). 
+    With httpx installed, all county files are downloaded over a single HTTP/2 
+    connection, and each file is parsed on a worker thread.
+
+    See https://www2.census.gov/geo/pdfs/maps-data/data/tiger/tgrshp2020/TGRSHP2020_TechDoc.pdf for more information.
     
-        url = f"https://www2.census.gov/geo/tiger/TIGER{year}/LINEARWATER/tl_{year}_{state}{valid_county}_linearwater.zip"
-        w = _load_tiger(url, cache = cache, subset_by = subset_by)
+    """
+
+
+    urls = _county_urls("linear_water", "linearwater", state, county, year, subset_by = subset_by)
+
+    county_water = await _fetch_many_async(urls, cache = cache, subset_by = subset_by,
+                                           max_connections = max_connections)
+
+    if len(county_water) == 1:
+        return county_water[0]
 
-        return w
+    return _concat(county_water)
 
 def coastline(year = None, cache = False):
     """
@@ -176,9 +271,7 @@ def coastline(year = None, cache = False):
     See https://www2.census.gov/geo/pdfs/maps-data/data/tiger/tgrshp2020/TGRSHP2020_TechDoc.pdf for more information.
     
     """
-    if year is None:
-        year = 2021
-        print(f"Using the default year of {year}")
+    year = _resolve_year("coastline", year)
 
     if year > 2016:
         url = f"https://www2.census.gov/geo/tiger/TIGER{year}/COASTLINE/tl_{year}_us_coastline.zip"
@@ -0,0 +1,135 @@
+import io
+import os
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import geopandas as gp
+import pytest
+from shapely.geometry import box
+
+import pygris.helpers as helpers
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Serves the routes registered on the server: each is a dict with the
+    # file body and optionally an ETag, a status to answer with instead,
+    # whether Range requests are honored, and a delay before answering
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+
+        route = self.server.routes.get(self.path)
+
+        if route is None:
+            return self._send(404, b"<html>Not Found</html>")
+
+        if route.get("delay"):
+            route["delay"].wait(10)
+
+        if route.get("status", 200) != 200:
+            return self._send(route["status"], b"<html>Service Unavailable</html>")
+
+        body = route["body"]
+        etag = route.get("etag")
+
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            return self._send(304, b"", etag = etag)
+
+        byte_range = self.headers.get("Range")
+
+        if byte_range and route.get("ranges", True):
+            start, _, end = byte_range[len("bytes="):].partition("-")
+            start, end = int(start), min(int(end), len(body) - 1)
+            return self._send(206, body[start:end + 1], etag = etag,
+                              content_range = f"bytes {start}-{end}/{len(body)}")
+
+        return self._send(200, body, etag = etag)
+
+    def _send(self, status, body, etag = None, content_range = None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        if content_range is not None:
+            self.send_header("Content-Range", content_range)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that time out and hang up are expected
+        pass
+
+
+@pytest.fixture
+def server():
+    srv = _Server(("127.0.0.1", 0), _Handler)
+    srv.routes = {}
+    srv.requests = []
+    srv.url = f"http://127.0.0.1:{srv.server_port}"
+
+    thread = threading.Thread(target = srv.serve_forever, kwargs = {"poll_interval": 0.05},
+                              daemon = True)
+    thread.start()
+
+    yield srv
+
+    srv.shutdown()
+    srv.server_close()
+
+
+def make_zip(n = 5, name = "tl_2021_99_test", attributes = None):
+    # A zipped shapefile of n unit squares in NAD83, with a GEOID column
+    # and any other columns given in attributes
+    gdf = gp.GeoDataFrame({"GEOID": [f"{i:02d}" for i in range(n)], **(attributes or {})},
+                          geometry = [box(i, 0, i + 1, 1) for i in range(n)],
+                          crs = "EPSG:4269")
+
+    buffer = io.BytesIO()
+
+    with zipfile.ZipFile(buffer, "w") as zf:
+        folder = os.path.join(os.environ.get("PYTEST_TMP", "/tmp"), f"pygris_{name}_{n}")
+        os.makedirs(folder, exist_ok = True)
+        gdf.to_file(os.path.join(folder, name + ".shp"))
+        for member in sorted(os.listdir(folder)):
+            zf.write(os.path.join(folder, member), member)
+
+    return buffer.getvalue()
+
+
+@pytest.fixture(params = ["requests", "httpx"])
+def client(request, monkeypatch):
+    # Run a test through each of the two HTTP clients
+    if request.param == "httpx":
+        pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+        monkeypatch.setattr(helpers, "_HTTPX", True)
+    else:
+        monkeypatch.setattr(helpers, "_HTTPX", False)
+
+    monkeypatch.setattr(helpers, "_CLIENT", None)
+
+    yield request.param
+
+    if helpers._CLIENT is not None:
+        helpers._CLIENT.close()
+
+
+@pytest.fixture(autouse = True)
+def cache_dir(tmp_path, monkeypatch):
+    # A fresh cache directory and empty session state for every test
+    directory = tmp_path / "cache"
+    monkeypatch.setattr(helpers.appdirs, "user_cache_dir", lambda appname: str(directory))
+    monkeypatch.setattr(helpers, "_VALIDATED", set())
+    monkeypatch.setattr(helpers, "_REVALIDATION_FAILED", False)
+    monkeypatch.setattr(helpers, "_WARMED_UP", True)
+    monkeypatch.setenv("PYTEST_TMP", str(tmp_path))
+    helpers._GDF_CACHE.clear()
+
+    return directory
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+import pygris
+import pygris.helpers as helpers
+import pygris.transportation as transportation
+import pygris.water as water
+from conftest import make_zip
+
+
+@pytest.fixture
+def county_files(server, monkeypatch):
+    # Three county files on the local server, in place of the Census URLs
+    sizes = {"001": 5, "003": 3, "005": 4}
+
+    for county, n in sizes.items():
+        server.routes[f"/{county}.zip"] = {"body": make_zip(n, name = f"tl_2021_44{county}_test")}
+
+    def county_urls(fn, kind, state, county, year, subset_by = None):
+        return [f"{server.url}/{i}.zip" for i in helpers._as_list(county)]
+
+    monkeypatch.setattr(water, "_county_urls", county_urls)
+    monkeypatch.setattr(transportation, "_county_urls", county_urls)
+
+    return sizes
+
+
+@pytest.mark.parametrize("fn, fn_async", [(pygris.roads, pygris.roads_async),
+                                          (pygris.address_ranges, pygris.address_ranges_async),
+                                          (pygris.area_water, pygris.area_water_async),
+                                          (pygris.linear_water, pygris.linear_water_async)])
+@pytest.mark.parametrize("cache", [False, True])
+def test_async_matches_sync(county_files, client, fn, fn_async, cache):
+    expected = fn("RI", ["001", "003", "005"], cache = cache)
+
+    helpers._GDF_CACHE.clear()
+
+    result = asyncio.run(fn_async("RI", ["001", "003", "005"], cache = cache))
+
+    assert result.equals(expected)
+
+
+@pytest.mark.parametrize("fn", [pygris.roads_async, pygris.area_water_async])
+def test_async_single_county(county_files, client, fn):
+    result = asyncio.run(fn("RI", "003"))
+
+    assert len(result) == 3
+
+
+@pytest.mark.parametrize("fn", [pygris.roads, pygris.area_water])
+@pytest.mark.parametrize("max_workers", [1, 8])
+def test_several_counties_are_combined_in_order(county_files, client, fn, max_workers):
+    gdf = fn("RI", ["001", "003", "005"], max_workers = max_workers)
+
+    assert len(gdf) == 12
+    assert gdf.index.tolist() == list(range(12))
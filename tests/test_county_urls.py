@@ -0,0 +1,105 @@
+import zipfile
+
+import geopandas as gp
+import pytest
+from shapely.geometry import box
+
+import pygris.helpers as helpers
+
+_COUNTY_URL = "https://www2.census.gov/geo/tiger/TIGER2021/COUNTY/tl_2021_us_county.zip"
+
+
+def _county_layer():
+    # A national county layer with Rhode Island's five counties side by
+    # side as unit squares, and one county of Massachusetts
+    return gp.GeoDataFrame({"STATEFP": ["44"] * 5 + ["25"],
+                            "COUNTYFP": ["001", "003", "005", "007", "009", "001"]},
+                           geometry = [box(i, 0, i + 1, 1) for i in range(6)],
+                           crs = "EPSG:4269")
+
+
+def _cache_counties(cache_dir, tmp_path):
+    # The county layer, downloaded to the cache directory
+    counties = _county_layer()
+
+    folder = tmp_path / "county"
+    folder.mkdir()
+    counties.to_file(folder / "tl_2021_us_county.shp")
+
+    cache_dir.mkdir(exist_ok = True)
+
+    with zipfile.ZipFile(cache_dir / "tl_2021_us_county.zip", "w") as zf:
+        for member in sorted(folder.iterdir()):
+            zf.write(member, member.name)
+
+    # Treat the cached file as already checked against the server
+    helpers._VALIDATED.add(_COUNTY_URL)
+
+
+def _counties_in(urls):
+    return [url.split("_")[-2] for url in urls]
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    def unreachable(*args, **kwargs):
+        raise AssertionError("nothing should be downloaded")
+
+    monkeypatch.setattr(helpers, "_download_file", unreachable)
+    monkeypatch.setattr(helpers, "_download_bytes", unreachable)
+
+
+def test_counties_outside_bbox_are_skipped(cache_dir, tmp_path, offline):
+    _cache_counties(cache_dir, tmp_path)
+
+    urls = helpers._county_urls("area_water", "areawater", "RI", ["001", "003", "005"], 2021,
+                                subset_by = (0.5, 0.2, 1.5, 0.8))
+
+    assert _counties_in(urls) == ["44001", "44003"]
+
+
+def test_geometry_without_crs_is_taken_as_nad83(cache_dir, tmp_path, offline):
+    _cache_counties(cache_dir, tmp_path)
+
+    subset = gp.GeoDataFrame(geometry = [box(3.2, 0.2, 3.8, 0.8)])
+
+    urls = helpers._county_urls("area_water", "areawater", "RI", ["001", "003", "007"], 2021,
+                                subset_by = subset)
+
+    assert _counties_in(urls) == ["44007"]
+
+
+def test_first_county_kept_when_none_intersect(cache_dir, tmp_path, offline):
+    _cache_counties(cache_dir, tmp_path)
+
+    urls = helpers._county_urls("area_water", "areawater", "RI", ["003", "005"], 2021,
+                                subset_by = (10, 10, 11, 11))
+
+    assert _counties_in(urls) == ["44003"]
+
+
+def test_all_counties_kept_without_cached_county_layer(cache_dir, offline):
+    urls = helpers._county_urls("area_water", "areawater", "RI", ["001", "003", "005"], 2021,
+                                subset_by = (0.5, 0.2, 1.5, 0.8))
+
+    assert _counties_in(urls) == ["44001", "44003", "44005"]
+
+
+def test_county_layer_read_this_session_is_used(cache_dir, offline):
+    # As if counties() had been called earlier without the cache
+    helpers._GDF_CACHE[(_COUNTY_URL, None, None, ())] = _county_layer()
+
+    urls = helpers._county_urls("area_water", "areawater", "RI", ["001", "003", "005"], 2021,
+                                subset_by = (0.5, 0.2, 1.5, 0.8))
+
+    assert _counties_in(urls) == ["44001", "44003"]
+
+
+def test_county_layer_for_other_states_is_not_used(cache_dir, offline):
+    counties = _county_layer()
+    helpers._GDF_CACHE[(_COUNTY_URL, "STATEFP IN ('25')", None, ())] = counties[counties.STATEFP == "25"]
+
+    urls = helpers._county_urls("area_water", "areawater", "RI", ["001", "003", "005"], 2021,
+                                subset_by = (0.5, 0.2, 1.5, 0.8))
+
+    assert _counties_in(urls) == ["44001", "44003", "44005"]
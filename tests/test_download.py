@@ -0,0 +1,304 @@
+import os
+
+import pytest
+
+import pygris.helpers as helpers
+from conftest import make_zip
+
+
+def _cached_files(cache_dir):
+    return sorted(os.listdir(cache_dir)) if cache_dir.exists() else []
+
+
+def test_uncached_read(server, client):
+    server.routes["/a.zip"] = {"body": make_zip(5)}
+
+    gdf = helpers._load_tiger(server.url + "/a.zip")
+
+    assert len(gdf) == 5
+    assert gdf.crs.to_epsg() == 4269
+
+
+def test_ranged_read_matches_whole_file(server, client, monkeypatch):
+    body = make_zip(40)
+    server.routes["/a.zip"] = {"body": body}
+
+    # Small blocks force the file to arrive in several ranges
+    monkeypatch.setattr(helpers, "_RANGE_SIZE", 1000)
+
+    assert helpers._download_bytes(server.url + "/a.zip") == body
+    assert sum("Range" in headers for _, headers in server.requests) > 2
+
+
+def test_server_ignoring_ranges(server, client):
+    body = make_zip(5)
+    server.routes["/a.zip"] = {"body": body, "ranges": False}
+
+    assert helpers._download_bytes(server.url + "/a.zip") == body
+
+
+def test_cached_read_writes_validator(server, client, cache_dir):
+    server.routes["/a.zip"] = {"body": make_zip(5), "etag": '"v1"'}
+
+    gdf = helpers._load_tiger(server.url + "/a.zip", cache = True)
+
+    assert len(gdf) == 5
+    assert (cache_dir / "a.zip.etag").read_text() == '"v1"'
+
+
+def test_revalidation_not_modified(server, client, cache_dir):
+    server.routes["/a.zip"] = {"body": make_zip(5), "etag": '"v1"'}
+    url = server.url + "/a.zip"
+
+    helpers._load_tiger(url, cache = True)
+
+    # A new session: the layer is no longer in memory and the URL has not
+    # been revalidated yet
+    helpers._GDF_CACHE.clear()
+    helpers._VALIDATED.clear()
+    server.requests.clear()
+
+    gdf = helpers._load_tiger(url, cache = True)
+
+    assert len(gdf) == 5
+    assert len(server.requests) == 1
+    assert server.requests[0][1].get("If-None-Match") == '"v1"'
+
+
+def test_revalidation_replaces_changed_file(server, client, cache_dir):
+    url = server.url + "/a.zip"
+    server.routes["/a.zip"] = {"body": make_zip(5), "etag": '"v1"'}
+
+    helpers._load_tiger(url, cache = True)
+
+    server.routes["/a.zip"] = {"body": make_zip(7), "etag": '"v2"'}
+    helpers._GDF_CACHE.clear()
+    helpers._VALIDATED.clear()
+
+    gdf = helpers._load_tiger(url, cache = True)
+
+    assert len(gdf) == 7
+    assert (cache_dir / "a.zip.etag").read_text() == '"v2"'
+
+
+@pytest.mark.parametrize("status", [404, 500, 503])
+def test_revalidation_error_keeps_cached_copy(server, client, cache_dir, status):
+    url = server.url + "/a.zip"
+    body = make_zip(5)
+    server.routes["/a.zip"] = {"body": body, "etag": '"v1"'}
+
+    helpers._load_tiger(url, cache = True)
+    before = _cached_files(cache_dir)
+
+    server.routes["/a.zip"] = {"body": body, "status": status}
+    helpers._GDF_CACHE.clear()
+    helpers._VALIDATED.clear()
+
+    gdf = helpers._load_tiger(url, cache = True)
+
+    assert len(gdf) == 5
+    assert (cache_dir / "a.zip").read_bytes() == body
+    assert (cache_dir / "a.zip.etag").read_text() == '"v1"'
+    assert _cached_files(cache_dir) == before
+
+
+def test_unresponsive_server_does_not_block_cached_read(server, client, cache_dir, monkeypatch):
+    import threading
+    import time
+
+    url = server.url + "/a.zip"
+    server.routes["/a.zip"] = {"body": make_zip(5), "etag": '"v1"'}
+
+    helpers._load_tiger(url, cache = True)
+
+    hang = threading.Event()
+    server.routes["/a.zip"]["delay"] = hang
+    monkeypatch.setattr(helpers, "_REVALIDATE_TIMEOUT", 0.5)
+    helpers._GDF_CACHE.clear()
+    helpers._VALIDATED.clear()
+
+    try:
+        start = time.monotonic()
+        gdf = helpers._load_tiger(url, cache = True)
+        elapsed = time.monotonic() - start
+    finally:
+        hang.set()
+
+    assert len(gdf) == 5
+    assert elapsed < 5
+    assert (cache_dir / "a.zip.etag").read_text() == '"v1"'
+    assert _cached_files(cache_dir) == ["a.parquet", "a.zip", "a.zip.etag"]
+
+
+def test_revalidation_stops_after_network_error(server, client, cache_dir):
+    url = server.url + "/a.zip"
+    server.routes["/a.zip"] = {"body": make_zip(5), "etag": '"v1"'}
+
+    helpers._load_tiger(url, cache = True)
+    helpers._GDF_CACHE.clear()
+    helpers._VALIDATED.clear()
+
+    # The server goes away: the first revalidation fails, and no other
+    # is attempted for the rest of the session
+    server.shutdown()
+    server.server_close()
+
+    assert len(helpers._load_tiger(url, cache = True)) == 5
+    assert helpers._REVALIDATION_FAILED
+
+    helpers._GDF_CACHE.clear()
+    server.requests.clear()
+
+    assert len(helpers._load_tiger(url, cache = True)) == 5
+    assert server.requests == []
+
+
+def test_missing_file_reports_url(server, client):
+    with pytest.raises(ValueError, match = "not found"):
+        helpers._load_tiger(server.url + "/missing.zip")
+
+
+def test_missing_file_is_not_cached(server, client, cache_dir):
+    with pytest.raises(ValueError, match = "not found"):
+        helpers._load_tiger(server.url + "/missing.zip", cache = True)
+
+    assert _cached_files(cache_dir) == []
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_server_error_is_raised_not_parsed(server, client, cache_dir, cache):
+    server.routes["/a.zip"] = {"body": make_zip(5), "status": 503}
+
+    with pytest.raises(helpers._NETWORK_ERRORS):
+        helpers._load_tiger(server.url + "/a.zip", cache = cache)
+
+    assert _cached_files(cache_dir) == []
+
+
+def test_census_url_falls_back_to_ftp(client, monkeypatch):
+    body = make_zip(5)
+    opened = []
+
+    class FakeFTP:
+        def __init__(self, url):
+            opened.append(url)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def read(self):
+            return body
+
+    def unreachable(url, headers = None):
+        raise helpers.requests.ConnectionError("unreachable")
+
+    monkeypatch.setattr(helpers, "_get", unreachable)
+    monkeypatch.setattr(helpers.urllib.request, "urlopen", lambda url, **kwargs: FakeFTP(url))
+
+    url = helpers._CENSUS_HTTPS + "geo/tiger/TIGER2021/STATE/tl_2021_us_state.zip"
+
+    assert helpers._download_bytes(url) == body
+    assert opened == [helpers._CENSUS_FTP + "geo/tiger/TIGER2021/STATE/tl_2021_us_state.zip"]
+
+
+def test_census_server_error_falls_back_to_ftp(client, monkeypatch):
+    body = make_zip(5)
+
+    def unavailable(url, headers = None):
+        response = helpers.requests.Response()
+        response.status_code = 503
+        response.url = url
+        return response
+
+    monkeypatch.setattr(helpers, "_get", unavailable)
+    monkeypatch.setattr(helpers.urllib.request, "urlopen",
+                        lambda url, **kwargs: helpers.io.BytesIO(body))
+
+    url = helpers._CENSUS_HTTPS + "geo/tiger/TIGER2021/STATE/tl_2021_us_state.zip"
+
+    assert helpers._download_bytes(url) == body
+
+
+def test_async_fetch_reports_missing_file(server, client):
+    import asyncio
+
+    server.routes["/a.zip"] = {"body": make_zip(5)}
+    urls = [server.url + "/a.zip", server.url + "/missing.zip"]
+
+    with pytest.raises(ValueError, match = "not found"):
+        asyncio.run(helpers._fetch_many_async(urls))
+
+
+def test_async_fetch_loads_duplicates_once(server, client):
+    import asyncio
+
+    server.routes["/a.zip"] = {"body": make_zip(5)}
+    server.routes["/b.zip"] = {"body": make_zip(3)}
+    urls = [server.url + "/a.zip", server.url + "/b.zip", server.url + "/a.zip"]
+
+    frames = asyncio.run(helpers._fetch_many_async(urls))
+
+    assert [len(f) for f in frames] == [5, 3, 5]
+    assert sorted(path for path, _ in server.requests) == ["/a.zip", "/b.zip"]
+
+
+def test_mirror_copy_kept_apart_from_parquet_copy(server, client, cache_dir, monkeypatch):
+    import geopandas as gp
+
+    server.routes["/a.zip"] = {"body": make_zip(5)}
+
+    # The mirror copy of the same layer has different contents
+    mirror = gp.GeoDataFrame({"GEOID": ["00", "01"]},
+                             geometry = gp.GeoSeries.from_xy([0, 1], [0, 1]),
+                             crs = "EPSG:4269")
+    mirror_file = cache_dir.parent / "a.parquet"
+    mirror.to_parquet(mirror_file)
+    server.routes["/mirror/a.parquet"] = {"body": mirror_file.read_bytes()}
+
+    monkeypatch.setattr(helpers, "_PARQUET_MIRROR", server.url + "/mirror")
+
+    url = server.url + "/a.zip"
+
+    assert len(helpers._load_tiger(url, cache = True)) == 5
+    assert len(helpers._load_tiger(url, cache = True, format = "parquet")) == 2
+
+    helpers._GDF_CACHE.clear()
+
+    assert len(helpers._load_tiger(url, cache = True)) == 5
+    assert len(helpers._load_tiger(url, cache = True, format = "parquet")) == 2
+    assert (cache_dir / "mirror" / "a.parquet").is_file()
+
+
+def test_repeated_read_is_served_from_memory(server, client):
+    server.routes["/a.zip"] = {"body": make_zip(5)}
+    url = server.url + "/a.zip"
+
+    first = helpers._load_tiger(url)
+    server.requests.clear()
+
+    second = helpers._load_tiger(url)
+
+    assert server.requests == []
+    assert second.equals(first)
+
+
+def test_cached_layer_is_returned_as_a_copy(server, client):
+    server.routes["/a.zip"] = {"body": make_zip(5)}
+    url = server.url + "/a.zip"
+
+    first = helpers._load_tiger(url)
+    first["GEOID"] = "changed"
+
+    assert (helpers._load_tiger(url)["GEOID"] != "changed").all()
+
+
+def test_subsets_are_cached_separately(server, client):
+    server.routes["/a.zip"] = {"body": make_zip(5)}
+    url = server.url + "/a.zip"
+
+    assert len(helpers._load_tiger(url, subset_by = (0.5, 0.2, 1.5, 0.8))) == 2
+    assert len(helpers._load_tiger(url)) == 5
+    assert len(helpers._load_tiger(url, subset_by = 3)) == 3
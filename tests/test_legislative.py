@@ -0,0 +1,44 @@
+import pytest
+
+import pygris.helpers as helpers
+import pygris.legislative as legislative
+from conftest import make_zip
+
+
+@pytest.fixture
+def vtd_file(server, monkeypatch):
+    # A cartographic boundary voting district file for California on the
+    # local server, with districts in Alameda (001), Alpine (003) and
+    # Amador (005) counties
+    counties = ["001", "003", "005", "001", "003", "005"]
+
+    server.routes["/cb_2020_06_vtd_500k.zip"] = {
+        "body": make_zip(6, name = "cb_2020_06_vtd_500k",
+                         attributes = {"STATEFP20": ["06"] * 6, "COUNTYFP20": counties,
+                                       "NAME20": [f"District {i}" for i in range(6)]})
+    }
+
+    def load_local(url, **kwargs):
+        return helpers._load_tiger(url.replace("https://www2.census.gov/geo/tiger/GENZ2020/shp", server.url),
+                                   **kwargs)
+
+    monkeypatch.setattr(legislative, "_load_tiger", load_local)
+
+
+@pytest.mark.parametrize("columns", [None, ["NAME20"]])
+def test_cb_voting_districts_for_counties(vtd_file, client, columns):
+    vtds = legislative.voting_districts(state = "CA", county = ["001", "Amador"], cb = True,
+                                        columns = columns)
+
+    assert vtds["NAME20"].tolist() == ["District 0", "District 2", "District 3", "District 5"]
+
+    if columns is None:
+        assert set(vtds["COUNTYFP20"]) == {"001", "005"}
+    else:
+        assert list(vtds.columns) == ["NAME20", "geometry"]
+
+
+def test_cb_voting_districts_for_one_county(vtd_file, client):
+    vtds = legislative.voting_districts(state = "CA", county = "003", cb = True, columns = ["NAME20"])
+
+    assert vtds["NAME20"].tolist() == ["District 1", "District 4"]
@@ -0,0 +1,13 @@
+import logging
+
+from pygris.helpers import validate_state, validate_county
+
+
+def test_fips_lookups_are_logged_not_printed(caplog, capsys):
+    with caplog.at_level(logging.INFO, logger = "pygris"):
+        assert validate_state("Texas") == "48"
+        assert validate_county("48", "Travis") == "453"
+
+    assert capsys.readouterr().out == ""
+    assert "Using FIPS code '48' for input 'Texas'" in caplog.messages
+    assert "Using FIPS code '453' for input 'Travis'" in caplog.messages
@@ -0,0 +1,22 @@
+import pygris
+import pygris.helpers as helpers
+from conftest import make_zip
+
+
+def test_get_session_is_used_for_downloads(server, client):
+    server.routes["/a.zip"] = {"body": make_zip(5)}
+
+    session = pygris.get_session()
+    session.headers["X-Test"] = "pygris"
+
+    try:
+        helpers._load_tiger(server.url + "/a.zip")
+    finally:
+        del session.headers["X-Test"]
+
+    if client == "httpx":
+        assert session is helpers._CLIENT
+    else:
+        assert session is helpers._SESSION
+
+    assert server.requests[0][1].get("X-Test") == "pygris"
@@ -0,0 +1,205 @@
+import warnings
+
+import geopandas as gp
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+from shapely.geometry import box
+
+import pygris.utils as utils
+
+
+# Synthetic stand-ins for the Census layers shift_geometry() and
+# erase_water() read: two lower-48 states, Alaska, Hawaii and Puerto Rico,
+# a grid of counties in Texas, and a few lakes in each county
+
+def _states(**kwargs):
+    rows = [("01", box(-125, 25, -96, 49)), ("48", box(-96, 25, -67, 49)),
+            ("02", box(-170, 52, -130, 71)), ("15", box(-160, 19, -154, 22.5)),
+            ("72", box(-67.5, 17.8, -65.2, 18.6))]
+
+    return gp.GeoDataFrame({"GEOID": [fips for fips, _ in rows]},
+                           geometry = [geometry for _, geometry in rows], crs = 4269)
+
+
+def _counties(**kwargs):
+    ids, geometries = [], []
+
+    for i, x in enumerate(np.arange(-100, -90, 2.0)):
+        for j, y in enumerate(np.arange(30, 36, 2.0)):
+            ids.append(f"48{i}{j:02d}")
+            geometries.append(box(x, y, x + 2, y + 2))
+
+    return gp.GeoDataFrame({"GEOID": ids}, geometry = geometries, crs = 4269)
+
+
+def _area_water(state, county, year = None, cache = False, **kwargs):
+    x0, y0, x1, y1 = _counties().set_index("GEOID").loc[state + county].geometry.bounds
+
+    rng = np.random.default_rng(int(state + county))
+
+    lakes = [shapely.Point(rng.uniform(x0, x1), rng.uniform(y0, y1)).buffer(rng.uniform(0.02, 0.3))
+             for _ in range(6)]
+
+    return gp.GeoDataFrame({"AWATER": [int(lake.area * 1e6) for lake in lakes]},
+                           geometry = lakes, crs = 4269)
+
+
+@pytest.fixture(autouse = True)
+def synthetic_layers(monkeypatch):
+    monkeypatch.setattr(utils, "states", _states)
+    monkeypatch.setattr(utils, "counties", _counties)
+    monkeypatch.setattr(utils, "area_water", _area_water)
+
+    for cached in (utils._us_counties, utils._minimal_states, utils._shift_reference):
+        cached.cache_clear()
+
+    yield
+
+    for cached in (utils._us_counties, utils._minimal_states, utils._shift_reference):
+        cached.cache_clear()
+
+
+# The original implementations, kept here to check the current ones against
+
+_PLACEMENT = {
+    (False, "below"): {"02": (0.06, -0.14, 0.5), "15": (0.32, 0.2, 1.5), "72": (0.75, 0.15, 2.5)},
+    (False, "outside"): {"02": (-0.08, 0.92, 0.5), "15": (0.05, 0.35, 1.5), "72": (1.0, 0.05, 2.5)},
+    (True, "below"): {"02": (0.2, -0.13, 1), "15": (0.6, -0.1, 1), "72": (0.75, -0.1, 1)},
+    (True, "outside"): {"02": (-0.25, 1.35, 1), "15": (0.0, 0.2, 1), "72": (0.95, -0.05, 1)}
+}
+
+_AREA_CRS = {"02": 3338, "15": "ESRI:102007", "72": 32161}
+
+
+def _reference_shift(input, geoid_column = None, preserve_area = False, position = "below"):
+    minimal_states = _states().to_crs("ESRI:102003")
+
+    boxes = {fips: gp.GeoDataFrame(geometry = minimal_states.query("GEOID == @fips").envelope)
+             for fips in ("02", "15", "72")}
+
+    input_albers = input.to_crs(minimal_states.crs)
+
+    if geoid_column is not None:
+        input_albers["state_fips"] = input_albers[geoid_column].str.slice(0, 2)
+    else:
+        all_boxes = pd.concat(boxes.values())
+        all_boxes["state_fips"] = list(boxes)
+        input_albers = input_albers.sjoin(all_boxes, how = "left")
+        input_albers["state_fips"] = input_albers["state_fips"].fillna("00")
+
+    bb = minimal_states.query('GEOID not in ["02", "15", "72"]').total_bounds
+
+    shapes_list = [input_albers.query('state_fips not in ["02", "15", "72"]')]
+
+    for fips, (x_frac, y_frac, scale) in _PLACEMENT[(preserve_area, position)].items():
+        area = input_albers.query("state_fips == @fips")
+
+        if area.shape[0] == 0:
+            continue
+
+        if fips == "15":
+            area = area.overlay(boxes["15"])
+
+        centroid = minimal_states.query("GEOID == @fips").to_crs(_AREA_CRS[fips]).centroid
+        cx, cy = centroid.x.values[0], centroid.y.values[0]
+
+        rescaled = area.to_crs(_AREA_CRS[fips])
+        rescaled.geometry = (rescaled.geometry.translate(xoff = -cx, yoff = -cy)
+                             .scale(xfact = scale, yfact = scale, origin = (cx, cy))
+                             .translate(xoff = bb[0] + x_frac * (bb[2] - bb[0]),
+                                        yoff = bb[1] + y_frac * (bb[3] - bb[1])))
+        rescaled.set_crs("ESRI:102003", inplace = True, allow_override = True)
+
+        shapes_list.append(rescaled)
+
+    return pd.concat(shapes_list).drop(["state_fips", "index_right"], axis = 1, errors = "ignore")
+
+
+def _reference_erase(input, area_threshold = 0.75):
+    county_proj = _counties().to_crs(input.crs)
+    county_proj["county_id"] = county_proj["GEOID"]
+    county_ids = county_proj.overlay(input, keep_geom_type = False)["county_id"].unique()
+
+    all_water = pd.concat([_area_water(i[:2], i[2:]).to_crs(input.crs) for i in county_ids],
+                          ignore_index = True)
+    all_water["water_rank"] = all_water.AWATER.rank(pct = True)
+
+    return input.overlay(all_water[all_water.water_rank >= area_threshold], how = "difference")
+
+
+def _features():
+    # One feature in each state, plus one in the lower 48 outside any state
+    points = [(-120, 40), (-80, 35), (-150, 60), (-157, 21), (-66, 18.2), (-100, 52)]
+
+    return gp.GeoDataFrame({"GEOID": ["01001", "48001", "02001", "15001", "72001", "31001"],
+                            "value": range(6)},
+                           geometry = [shapely.Point(x, y).buffer(0.5) for x, y in points],
+                           crs = 4269)
+
+
+def _assert_same_geometry(result, expected, tolerance):
+    assert len(result) == len(expected)
+
+    for a, b in zip(result.geometry, expected.geometry):
+        assert a.symmetric_difference(b).area <= tolerance * max(b.area, 1)
+
+
+@pytest.mark.parametrize("preserve_area", [False, True])
+@pytest.mark.parametrize("position", ["below", "outside"])
+@pytest.mark.parametrize("geoid_column", [None, "GEOID"])
+@pytest.mark.parametrize("subset", ["all", "lower48", "alaska", "projected"])
+def test_shift_geometry_matches_original(subset, geoid_column, position, preserve_area):
+    features = _features()
+
+    if subset == "lower48":
+        features = features[features.GEOID.str[:2].isin(["01", "48", "31"])]
+    elif subset == "alaska":
+        features = features[features.GEOID.str[:2].isin(["01", "02"])]
+    elif subset == "projected":
+        features = features.to_crs(5070)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = _reference_shift(features, geoid_column, preserve_area, position)
+
+    result = utils.shift_geometry(features, geoid_column = geoid_column,
+                                  preserve_area = preserve_area, position = position)
+
+    assert result.crs == "ESRI:102003"
+    assert list(result.columns) == list(expected.columns)
+    assert result["value"].tolist() == expected["value"].tolist()
+    _assert_same_geometry(result, expected, 1e-9)
+
+
+def test_shift_geometry_rejects_unknown_position():
+    with pytest.raises(ValueError):
+        utils.shift_geometry(_features(), position = "above")
+
+
+@pytest.mark.parametrize("area_threshold", [0, 0.5, 0.75])
+@pytest.mark.parametrize("crs", [4269, 5070])
+def test_erase_water_matches_original(area_threshold, crs):
+    features = gp.GeoDataFrame({"id": range(4)},
+                               geometry = [box(-99.5, 30.5, -95.5, 33.5), box(-93, 34, -91, 35.5),
+                                           box(-97.3, 31.1, -96.8, 31.6), box(-91.5, 30.2, -90.5, 30.8)],
+                               crs = 4269).to_crs(crs)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = _reference_erase(features, area_threshold).sort_values("id")
+
+    result = utils.erase_water(features, area_threshold = area_threshold, year = 2021).sort_values("id")
+
+    assert result.crs == features.crs
+    assert list(result.columns) == list(expected.columns)
+    assert result["id"].tolist() == expected["id"].tolist()
+    _assert_same_geometry(result, expected, 1e-9)
+
+
+def test_erase_water_outside_us():
+    features = gp.GeoDataFrame(geometry = [box(10, 50, 11, 51)], crs = 4269)
+
+    with pytest.raises(ValueError):
+        utils.erase_water(features, year = 2021)
@@ -0,0 +1,55 @@
+import logging
+import threading
+
+import pygris
+import pygris.helpers as helpers
+
+# The real Thread class, kept before tests replace it
+_Thread = threading.Thread
+
+
+def test_warmup():
+    assert pygris.warmup() is None
+
+
+def test_background_warmup_starts_once(monkeypatch):
+    started = []
+
+    class Thread:
+        def __init__(self, target, daemon):
+            started.append(target)
+
+        def start(self):
+            pass
+
+    monkeypatch.setattr(helpers, "_WARMED_UP", False)
+    monkeypatch.setattr(helpers.threading, "Thread", Thread)
+
+    barrier = threading.Barrier(8)
+
+    def first_load():
+        barrier.wait()
+        helpers._start_warmup()
+
+    workers = [_Thread(target = first_load) for _ in range(8)]
+
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert started == [helpers._background_warmup]
+
+
+def test_background_warmup_failure_is_logged(monkeypatch, caplog):
+    def fail():
+        raise RuntimeError("no PROJ database")
+
+    monkeypatch.setattr(helpers, "warmup", fail)
+
+    with caplog.at_level(logging.WARNING, logger = "pygris"):
+        helpers._background_warmup()
+
+    assert "Background warm-up failed" in caplog.messages
+    assert caplog.records[0].exc_info[0] is RuntimeError
+